@@ -16,12 +16,14 @@ setup(
     install_requires=[
         "typer>=0.9.0",
         "rich>=13.0.0",
-        "psutil>=5.9.0",
+        "psutil>=6.0.0",
         "requests>=2.31.0",
         "pydantic>=2.0.0",
         "pydantic-settings>=2.0.0",
         "jinja2>=3.1.0",
         "python-dotenv>=1.0.0",
+        "orjson>=3.9.0",
+        "numpy>=1.24.0",
     ],
     extras_require={
         "dev": [
@@ -30,7 +32,13 @@ setup(
             "black>=23.0.0",
             "mypy>=1.0.0",
             "isort>=5.0.0",
-        ]
+        ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
+        "uvloop": [
+            "uvloop>=0.18.0; sys_platform != 'win32'",
+        ],
     },
     entry_points={
         "console_scripts": [
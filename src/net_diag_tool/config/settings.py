@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from typing import Optional
 
@@ -14,10 +14,11 @@ class Settings(BaseSettings):
     
     REPORT_OUTPUT_DIR: str = "./reports"
     INCLUDE_SYSTEM_METRICS: bool = True
+    # Read interface addresses via getifaddrs(3) directly; False uses psutil
+    USE_FAST_IFADDRS: bool = True
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # Frozen: the instance is parsed once and shared by every module
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", frozen=True)
 
 @lru_cache()
 def get_settings() -> Settings:
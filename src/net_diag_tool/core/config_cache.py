@@ -0,0 +1,19 @@
+import copy
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+@lru_cache(maxsize=16)
+def _parse_json(path: str, mtime_ns: int) -> Any:
+    # mtime_ns is part of the cache key so an edited file is re-read
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def load_json_config(path: Path) -> Any:
+    """
+    Returns a private copy of a JSON config file, parsed at most once per file
+    version. Raises OSError if the file can't be read, ValueError if it isn't valid JSON.
+    """
+    return copy.deepcopy(_parse_json(str(path), path.stat().st_mtime_ns))
@@ -1,20 +1,108 @@
 import sqlite3
+import threading
+import time
+import weakref
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple, Union
+
+_INSERT_CHECK_SQL = '''
+    INSERT INTO service_checks 
+    (service_name, service_type, status, response_time_ms, status_code, error_message, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+def _utc_timestamp(value: Union[datetime, str, None] = None) -> str:
+    """
+    Formats a check timestamp as a fixed-width UTC string so that rows sort and
+    range-compare lexicographically. ISO strings are parsed first; naive values
+    are treated as local time.
+    """
+    if value is None:
+        value = datetime.now(timezone.utc)
+    elif isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.astimezone(timezone.utc).strftime(_TIMESTAMP_FORMAT)
+
+def local_time(timestamp: str) -> datetime:
+    """Converts a stored UTC check timestamp back to a naive local datetime for display."""
+    value = datetime.strptime(timestamp, _TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return value.astimezone().replace(tzinfo=None)
+
+def _close_connection(conn: sqlite3.Connection):
+    """Runs PRAGMA optimize and closes a connection."""
+    try:
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+# Hourly uptime rollup, upserted in the same transaction as the raw check row.
+# Latency is summed over non-NULL samples only, matching AVG(response_time_ms).
+_UPSERT_UPTIME_SQL = '''
+    INSERT INTO uptime_agg (service_name, hour_bucket, up, total, lat_sum, lat_count)
+    VALUES (?, CAST(strftime('%s', ?) AS INTEGER) / 3600, ?, 1, ?, ?)
+    ON CONFLICT(service_name, hour_bucket) DO UPDATE SET
+        up = up + excluded.up,
+        total = total + 1,
+        lat_sum = lat_sum + excluded.lat_sum,
+        lat_count = lat_count + excluded.lat_count
+'''
+
+# Rebuilds the hourly rollup from raw history
+_BACKFILL_UPTIME_SQL = '''
+    INSERT INTO uptime_agg (service_name, hour_bucket, up, total, lat_sum, lat_count)
+    SELECT 
+        service_name,
+        CAST(strftime('%s', timestamp) AS INTEGER) / 3600,
+        SUM(CASE WHEN status = 'up' THEN 1 ELSE 0 END),
+        COUNT(*),
+        COALESCE(SUM(response_time_ms), 0),
+        COUNT(response_time_ms)
+    FROM service_checks
+    WHERE timestamp IS NOT NULL
+    GROUP BY 1, 2
+'''
 
 class DatabaseManager:
+    # Refresh planner statistics after this many inserted checks
+    ANALYZE_EVERY = 10_000
+    # Attempts for a write that fails with "database is locked"
+    WRITE_RETRIES = 5
+
     def __init__(self, db_path: str = "netdiag.db"):
         self.db_path = db_path
+        # One shared connection for the lifetime of the manager; the lock
+        # serializes access since it is used from worker threads too.
+        self._lock = threading.Lock()
+        self._conn = self._get_connection()
+        # Uptime rollups keyed by (service_name, hours) -> (hour_bucket, stats);
+        # a service's entries are dropped whenever new checks are logged for it.
+        self._uptime_cache: Dict[Tuple[str, int], Tuple[str, Dict[str, Any]]] = {}
+        self._inserts_since_analyze = 0
         self._init_db()
+        # Closes the connection at exit or when the manager is collected, without
+        # an atexit entry holding a strong reference to every manager ever created
+        self._finalizer = weakref.finalize(self, _close_connection, self._conn)
 
     def _get_connection(self):
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Per-connection tuning: WAL only needs an fsync at checkpoint time,
+        # so NORMAL is safe and avoids an fsync per logged check.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        return conn
 
     def _init_db(self):
-        conn = self._get_connection()
+        conn = self._conn
         cursor = conn.cursor()
         
+        # Journal mode is persistent in the database file, set it once
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
         # Service Checks Table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS service_checks (
@@ -42,67 +130,192 @@ class DatabaseManager:
             )
         ''')
         
+        # Uptime Rollup Table (one row per service per UTC hour)
+        agg_exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'uptime_agg'"
+        ).fetchone()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS uptime_agg (
+                service_name TEXT NOT NULL,
+                hour_bucket INTEGER NOT NULL,
+                up INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                lat_sum REAL NOT NULL DEFAULT 0,
+                lat_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (service_name, hour_bucket)
+            )
+        ''')
+        # Schema version 0 stored the checkers' naive local datetimes as-is; rewrite
+        # those rows once in the UTC format so history sorts and filters consistently
+        legacy = []
+        if cursor.execute("PRAGMA user_version").fetchone()[0] < 1:
+            legacy = cursor.execute(
+                "SELECT id, timestamp FROM service_checks WHERE timestamp IS NOT NULL"
+            ).fetchall()
+            if legacy:
+                cursor.executemany(
+                    "UPDATE service_checks SET timestamp = ? WHERE id = ?",
+                    [(_utc_timestamp(ts), row_id) for row_id, ts in legacy]
+                )
+                cursor.execute("DELETE FROM uptime_agg")
+            cursor.execute("PRAGMA user_version = 1")
+        if legacy or not agg_exists:
+            # Backfill from existing history when upgrading an older database
+            cursor.execute(_BACKFILL_UPTIME_SQL)
+        
+        # Indexes for the history/uptime lookups (service + time range)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_checks_service_ts
+            ON service_checks(service_name, timestamp DESC)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_incidents_service
+            ON incidents(service_name, start_time)
+        ''')
+        
+        # Refresh planner statistics so the new indexes are picked up
+        cursor.execute("ANALYZE")
+        
         conn.commit()
-        conn.close()
+
+    def close(self):
+        """Runs PRAGMA optimize and closes the shared connection."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._finalizer.detach()
+            conn, self._conn = self._conn, None
+            _close_connection(conn)
+
+    @staticmethod
+    def check_row(result: Dict[str, Any], service_name: str, service_type: str) -> Tuple:
+        """Builds a service_checks row tuple from a check result."""
+        return (
+            service_name,
+            service_type,
+            result.get('status'),
+            result.get('response_time_ms'),
+            result.get('status_code'),
+            result.get('error_message') or result.get('error'),
+            _utc_timestamp(result.get('timestamp'))
+        )
 
     def log_check(self, result: Dict[str, Any], service_name: str, service_type: str):
         """Logs a single service check result."""
-        conn = self._get_connection()
-        try:
-            conn.execute('''
-                INSERT INTO service_checks 
-                (service_name, service_type, status, response_time_ms, status_code, error_message, timestamp)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                service_name,
-                service_type,
-                result.get('status'),
-                result.get('response_time_ms'),
-                result.get('status_code'),
-                result.get('error_message') or result.get('error'),
-                result.get('timestamp')
-            ))
-            conn.commit()
-        finally:
-            conn.close()
+        self.log_checks_bulk([self.check_row(result, service_name, service_type)])
+
+    def log_checks_bulk(self, rows: List[Tuple], rollup_only: Sequence[Tuple] = ()):
+        """
+        Logs many check rows (see check_row) in a single transaction.
+        `rollup_only` rows are counted in the uptime rollup without being
+        stored in the raw history.
+        """
+        # busy_timeout covers most contention; retry with backoff if another
+        # process still holds the write lock when it expires.
+        for attempt in range(self.WRITE_RETRIES):
+            try:
+                with self._lock, self._conn:
+                    self._conn.executemany(_INSERT_CHECK_SQL, rows)
+                    self._conn.executemany(_UPSERT_UPTIME_SQL, [
+                        (row[0], row[6], 1 if row[2] == 'up' else 0, row[3] or 0.0, 0 if row[3] is None else 1)
+                        for row in (*rows, *rollup_only)
+                    ])
+                break
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) or attempt == self.WRITE_RETRIES - 1:
+                    raise
+                time.sleep(0.01 * 2 ** attempt)
+        
+        with self._lock:
+            self._invalidate_uptime({row[0] for row in (*rows, *rollup_only)})
+            self._inserts_since_analyze += len(rows)
+            run_analyze = self._inserts_since_analyze >= self.ANALYZE_EVERY
+            if run_analyze:
+                self._inserts_since_analyze = 0
+        
+        if run_analyze:
+            threading.Thread(target=self._analyze, name="db-analyze", daemon=True).start()
+
+    def _analyze(self):
+        """Refreshes service_checks statistics for the query planner."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("ANALYZE service_checks")
+
+    def _invalidate_uptime(self, service_names):
+        for key in [k for k in self._uptime_cache if k[0] in service_names]:
+            del self._uptime_cache[key]
+
+    def iter_history(self, service_name: str, limit: int = 100, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Streams check history for a service, newest first, in fetchmany chunks."""
+        with self._lock:
+            cursor = self._conn.execute('''
+                SELECT * FROM service_checks 
+                WHERE service_name = ? 
+                ORDER BY timestamp DESC 
+                LIMIT ?
+            ''', (service_name, limit))
+            cols = [c[0] for c in cursor.description]
+        
+        while True:
+            # Lock per chunk only, so a slow consumer doesn't block writers
+            with self._lock:
+                chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                break
+            for row in chunk:
+                yield dict(zip(cols, row))
 
     def get_history(self, service_name: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Retrieves check history for a service."""
-        conn = self._get_connection()
-        conn.row_factory = sqlite3.Row
-        cursor = conn.execute('''
-            SELECT * FROM service_checks 
-            WHERE service_name = ? 
-            ORDER BY timestamp DESC 
-            LIMIT ?
-        ''', (service_name, limit))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return list(self.iter_history(service_name, limit))
 
     def get_uptime_stats(self, service_name: str, hours: int = 24) -> Dict[str, Any]:
-        """Calculates uptime percentage from DB."""
-        conn = self._get_connection()
-        cursor = conn.execute('''
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'up' THEN 1 ELSE 0 END) as success,
-                AVG(response_time_ms) as avg_latency
-            FROM service_checks 
-            WHERE service_name = ? 
-            AND timestamp >= datetime('now', ?)
-        ''', (service_name, f'-{hours} hours'))
-        
-        row = cursor.fetchone()
-        conn.close()
+        """
+        Calculates uptime percentage from the hourly rollups covering the last
+        `hours` UTC hours (current hour included); cached per service until the next insert.
+        """
+        now = datetime.now(timezone.utc)
+        bucket = now.strftime("%Y-%m-%d %H")
+        first_bucket = int(now.timestamp()) // 3600 - hours + 1
+        key = (service_name, hours)
         
-        total = row[0] or 0
-        success = row[1] or 0
-        avg_latency = row[2] or 0
+        with self._lock:
+            cached = self._uptime_cache.get(key)
+            if cached and cached[0] == bucket:
+                return dict(cached[1])
+            
+            row = self._conn.execute('''
+                SELECT SUM(total), SUM(up), SUM(lat_sum), SUM(lat_count)
+                FROM uptime_agg 
+                WHERE service_name = ? 
+                AND hour_bucket >= ?
+            ''', (service_name, first_bucket)).fetchone()
         
-        return {
-            "uptime_percent": (success / total * 100) if total > 0 else 0.0,
-            "total_checks": total,
-            "avg_latency": round(avg_latency, 2)
-        }
+            total = row[0] or 0
+            success = row[1] or 0
+            lat_count = row[3] or 0
+            avg_latency = (row[2] / lat_count) if lat_count else 0
+            
+            stats = {
+                "uptime_percent": (success / total * 100) if total > 0 else 0.0,
+                "total_checks": total,
+                "avg_latency": round(avg_latency, 2)
+            }
+            self._uptime_cache[key] = (bucket, stats)
+        return dict(stats)
+
+    def get_uptime_buckets(self, service_name: str, hours: int = 24) -> List[Tuple[int, int, int]]:
+        """
+        Returns (hour_bucket, up, total) rollup rows for the last `hours` UTC hours,
+        oldest first. Used to seed in-memory uptime windows at start-up.
+        """
+        first_bucket = int(datetime.now(timezone.utc).timestamp()) // 3600 - hours + 1
+        with self._lock:
+            return self._conn.execute('''
+                SELECT hour_bucket, up, total
+                FROM uptime_agg
+                WHERE service_name = ?
+                AND hour_bucket >= ?
+                ORDER BY hour_bucket
+            ''', (service_name, first_bucket)).fetchall()
@@ -1,17 +1,55 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from net_diag_tool.config.settings import get_settings
 
 settings = get_settings()
 
-def setup_logger(name: str) -> logging.Logger:
+# Records are enqueued by the caller and written by a single listener thread,
+# so file/console I/O never blocks the diagnostic and monitoring loops.
+_queue = queue.SimpleQueue()
+
+class BufferedFileHandler(logging.FileHandler):
     """
-    Configures and returns a logger instance with file and console handlers.
+    FileHandler that buffers writes instead of flushing every record.
+    The buffer is flushed on a timer, on WARNING and above, and on close.
     """
-    logger = logging.getLogger(name)
-    logger.setLevel(settings.LOG_LEVEL)
 
+    def __init__(self, filename, flush_interval: float = 0.5, buffer_size: int = 65536, **kwargs):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        super().__init__(filename, **kwargs)
+        self._stop_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-flush", daemon=True)
+        self._flusher.start()
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self._stop_event.set()
+        super().close()
+
+def _build_handlers():
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -22,13 +60,39 @@ def setup_logger(name: str) -> logging.Logger:
     )
 
     # File Handler
-    file_handler = logging.FileHandler(log_dir / "app.log")
+    file_handler = BufferedFileHandler(log_dir / "app.log")
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+
+    return file_handler, console_handler
+
+_handlers = _build_handlers()
+_listener = QueueListener(_queue, *_handlers, respect_handler_level=True)
+_listener.start()
+
+def _shutdown():
+    # Drain the queue first, then flush and close the buffered file handler
+    _listener.stop()
+    _handlers[0].close()
+
+atexit.register(_shutdown)
+
+def setup_logger(name: str) -> logging.Logger:
+    """
+    Configures and returns a logger instance that hands records to the
+    background file and console handlers.
+    """
+    logger = logging.getLogger(name)
+    # Already configured by an earlier call; adding another handler would
+    # write every record twice.
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(settings.LOG_LEVEL)
+    logger.addHandler(QueueHandler(_queue))
+    logger.propagate = False
 
     return logger
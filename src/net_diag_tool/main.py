@@ -1,19 +1,39 @@
 import typer
 import os
+import orjson
+from pathlib import Path
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
+from net_diag_tool.core.config_cache import load_json_config
 from net_diag_tool.core.logger import setup_logger
 from net_diag_tool.config.settings import get_settings
-from net_diag_tool.modules.network.diagnostics import NetworkDiagnostics
-from net_diag_tool.modules.system.health import SystemHealthMonitor
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Initialize components
 app = typer.Typer(name="netdiag")
-console = Console()
+console = Console(highlight=False)
 logger = setup_logger("main")
 settings = get_settings()
 
+# Point to the correct config location inside src/net_diag_tool/config
+SERVICES_CONFIG_PATH = Path(__file__).parent / "config" / "services.json"
+
+def _load_services_config(config_path: Path) -> dict:
+    """Returns a private copy of the services config, parsed at most once per file version."""
+    try:
+        return load_json_config(config_path)
+    except (OSError, ValueError):
+        return {"services": []}
+
+def _save_services_config(config_path: Path, config: dict):
+    """Writes the services config atomically (temp file + rename)."""
+    tmp_path = config_path.with_suffix(".json.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    tmp_path.replace(config_path)
+
 @app.command()
 def monitor_system():
     """
@@ -33,6 +53,9 @@ def run_diagnostics(
     """
     Run the standard diagnostic suite.
     """
+    from net_diag_tool.modules.network.diagnostics import NetworkDiagnostics
+    from net_diag_tool.modules.system.health import SystemHealthMonitor
+
     console.print(f"[bold green]Starting {settings.APP_NAME}...[/bold green]")
     logger.info("Starting diagnostic session")
 
@@ -46,43 +69,50 @@ def run_diagnostics(
     console.print(f"Hostname: {results['local_info'].get('hostname')}")
     console.print(f"Active Connections: {results['local_info'].get('active_connections_count')}")
 
-    # 2. Network Checks (Ping)
+    # 2-3. Network probes are independent I/O waits, so they run concurrently.
+    # Status lines are printed up front to keep console output in order.
     console.print(f"[yellow]Pinging Targets ({settings.PING_TARGET_PRIMARY}, {settings.PING_TARGET_SECONDARY})...[/yellow]")
-    results['ping_primary'] = tool.ping_host(settings.PING_TARGET_PRIMARY)
-    results['ping_secondary'] = tool.ping_host(settings.PING_TARGET_SECONDARY)
-    
-    # 3. HTTP Check
     console.print("[yellow]Checking Internet Access (HTTP)...[/yellow]")
-    results['internet_http'] = tool.check_http_status("https://www.google.com")
-
-    # 4. System Checks
-    console.print("[yellow]Running System Checks...[/yellow]")
-    # Use the new monitor's methods but just get snapshot
-    results['system'] = {
-        "cpu": sys_monitor.get_cpu_metrics(),
-        "memory": sys_monitor.get_memory_metrics(),
-        "disk": sys_monitor.get_disk_metrics()
-    }
-    
-    # 5. Full Mode Extras
     if full:
         console.print("[bold cyan]Running Detailed Diagnostics (Full Mode)...[/bold cyan]")
-        
-        # DNS
         console.print("[yellow]Detailed DNS Lookup...[/yellow]")
-        results['dns_primary'] = tool.dns_lookup("google.com")
-        
-        # Bandwidth
-        console.print("[yellow]Testing Bandwidth...[/yellow]")
-        results['bandwidth'] = tool.bandwidth_test()
-        
         # Port Scan (Localhost or Gateway)
         # For safety/demo, we scan localhost or a known safe target. 
         # scanning settings.PING_TARGET_PRIMARY (8.8.8.8) is not polite.
         # We will skip port scan in automated run unless specified target, 
         # or scan localhost.
         console.print("[yellow]Scanning Local Ports...[/yellow]")
-        results['localhost_scan'] = tool.port_scan("localhost", ports=[22, 80, 443, 8080, 3306])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            'ping_primary': executor.submit(tool.ping_host, settings.PING_TARGET_PRIMARY),
+            'ping_secondary': executor.submit(tool.ping_host, settings.PING_TARGET_SECONDARY),
+            'internet_http': executor.submit(tool.check_http_status, "https://www.google.com"),
+        }
+        if full:
+            futures['dns_primary'] = executor.submit(tool.dns_lookup, "google.com")
+            futures['localhost_scan'] = executor.submit(tool.port_scan, "localhost", ports=[22, 80, 443, 8080, 3306])
+
+        # 4. System Checks (collected while the network probes are in flight;
+        # the CPU sample's blocking interval overlaps the process/disk scans)
+        console.print("[yellow]Running System Checks...[/yellow]")
+        # Use the new monitor's methods but just get snapshot
+        system_futures = {
+            "cpu": executor.submit(sys_monitor.get_cpu_metrics),
+            "memory": executor.submit(sys_monitor.get_memory_metrics),
+            "disk": executor.submit(sys_monitor.get_disk_metrics)
+        }
+
+        for key, future in futures.items():
+            results[key] = future.result()
+        results['system'] = {key: future.result() for key, future in system_futures.items()}
+    
+    # 5. Full Mode Extras
+    if full:
+        # Bandwidth runs last and alone: concurrent traffic would skew the
+        # measurement and its progress bar would interleave with other output.
+        console.print("[yellow]Testing Bandwidth...[/yellow]")
+        results['bandwidth'] = tool.bandwidth_test()
 
     # Display Summary Table
     table = Table(title="Diagnostic Summary")
@@ -90,31 +120,38 @@ def run_diagnostics(
     table.add_column("Status", style="magenta")
     table.add_column("Details", style="green")
 
+    # Rows are collected as tuples; only the status cell carries markup, the
+    # rest are passed as Text so Rich doesn't parse them.
+    rows = []
+
     # Ping 1
     p1 = results['ping_primary']
     status_p1 = "[green]PASS[/green]" if p1['success'] else "[red]FAIL[/red]"
-    table.add_row(f"Ping {p1['host']}", status_p1, f"Loss: {p1['packet_loss_percent']}%, Latency: {p1.get('avg_latency_ms')}ms")
+    rows.append((f"Ping {p1['host']}", status_p1, f"Loss: {p1['packet_loss_percent']}%, Latency: {p1.get('avg_latency_ms')}ms"))
 
     # HTTP
     http = results['internet_http']
     status_http = "[green]PASS[/green]" if http['is_active'] else "[red]FAIL[/red]"
-    table.add_row("Internet (HTTP)", status_http, f"Code: {http.get('status_code')} Time: {http.get('response_time_ms')}ms")
+    rows.append(("Internet (HTTP)", status_http, f"Code: {http.get('status_code')} Time: {http.get('response_time_ms')}ms"))
 
     # System
     sys = results['system']
     # CPU
     cpu_data = sys.get('cpu', {})
-    table.add_row("CPU Usage", "INFO", f"{cpu_data.get('total_usage')}%")
+    rows.append(("CPU Usage", "INFO", f"{cpu_data.get('total_usage')}%"))
     
     # Memory
     mem_data = sys.get('memory', {})
-    table.add_row("Memory Usage", "INFO", f"{mem_data.get('percent')}% Used")
+    rows.append(("Memory Usage", "INFO", f"{mem_data.get('percent')}% Used"))
     
     # Disk (Show first disk or aggregate)
     disks = sys.get('disk', [])
     if disks:
          d = disks[0]
-         table.add_row(f"Disk ({d.get('mountpoint')})", "INFO", f"{d.get('percent')}% Used")
+         rows.append((f"Disk ({d.get('mountpoint')})", "INFO", f"{d.get('percent')}% Used"))
+
+    for check, status, details in rows:
+        table.add_row(Text(check), status, Text(details))
 
     console.print(table)
 
@@ -224,21 +261,12 @@ def configure():
     """
     Interactive setup wizard to add services to monitor.
     """
-    from pathlib import Path
-    import json
-    
-    # Point to the correct config location inside src/net_diag_tool/config
-    config_path = Path(__file__).parent / "config" / "services.json"
+    config_path = SERVICES_CONFIG_PATH
     
-    # Load existing
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except:
-            config = {"services": []}
-    else:
-        config = {"services": []}
+    # Load existing; edits stay in memory until the wizard exits
+    config = _load_services_config(config_path)
+    config.setdefault("services", [])
+    changed = False
         
     console.print(f"[bold cyan]NetDiag Configuration Wizard[/bold cyan]")
     console.print(f"Current services: {len(config.get('services', []))}")
@@ -264,6 +292,7 @@ def configure():
             service["check_interval"] = int(typer.prompt("Check Interval (seconds)", default="60"))
             
             config["services"].append(service)
+            changed = True
             console.print(f"[green]Added {name}![/green]")
             
         elif choice.lower() == 'l':
@@ -273,9 +302,10 @@ def configure():
         elif choice.lower() == 'e':
             break
             
-    # Save
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=4)
+    # Save (once, and only if something was added)
+    if not changed:
+        return
+    _save_services_config(config_path, config)
         
     console.print(f"[bold green]Configuration saved to {config_path}[/bold green]")
 
@@ -1,23 +1,118 @@
 import asyncio
+import importlib.util
 import httpx
-import socket
 import time
-import json
-import dns.resolver
+import orjson
+import dns.asyncresolver
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from jinja2 import Template
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from jinja2 import Environment
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
 
 from net_diag_tool.core.logger import setup_logger
-from net_diag_tool.core.database import DatabaseManager
+from net_diag_tool.core.database import DatabaseManager, local_time
 
 logger = setup_logger(__name__)
 console = Console()
 
+# HTTP/2 needs the optional h2 package (pip install net-diag-tool[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_async_resolver: Optional[dns.asyncresolver.Resolver] = None
+
+def _get_async_resolver() -> dns.asyncresolver.Resolver:
+    """
+    Returns the shared async resolver, built on first use so resolv.conf is
+    parsed once per process rather than once per check.
+    """
+    global _async_resolver
+    if _async_resolver is None:
+        resolver = dns.asyncresolver.Resolver()
+        resolver.timeout = 2.0
+        resolver.lifetime = 5.0
+        _async_resolver = resolver
+    return _async_resolver
+
+# Parsed once at import rather than on every export_status_page call
+_STATUS_PAGE_TEMPLATE = Environment(autoescape=True).from_string("""<!DOCTYPE html><html><head><title>Service Status</title><style>
+            body{font-family:sans-serif;padding:20px;background:#f4f6f8}
+            .card{background:white;padding:15px;margin:10px 0;border-radius:5px;border-left:5px solid #ccc;box-shadow:0 1px 3px rgba(0,0,0,0.1)}
+            .up{border-left-color:#28a745}.down{border-left-color:#dc3545}
+            h2{margin:0 0 10px 0}.metric{margin-right:15px;color:#555}
+            </style></head><body><h1>System Status</h1><p>Generated: {{timestamp}}</p>
+            {% for name, data in services.items() %}{% set last = data.latest %}
+            <div class="card {{'up' if last and last.status=='up' else 'down'}}">
+            <h2>{{name}} <span style="float:right;font-size:0.8em;color:{{'green' if last.status=='up' else 'red'}}">{{last.status|upper}}</span></h2>
+            {% if last %}<div><span class="metric">Latency: {{last.response_time_ms}}ms</span><span class="metric">Uptime: {{"%.1f"|format(data.stats.uptime_percent)}}%</span></div>
+            {% else %}<p>No data</p>{% endif %}</div>{% endfor %}</body></html>""")
+
+class _UptimeWindow:
+    """
+    Sliding-window up/total counter, so the dashboard's uptime is O(1) per
+    refresh. Entries are (epoch_ts, ups, total): single check results, or the
+    hourly rollups loaded from the database on start-up.
+    """
+
+    def __init__(self, span: float = 86400):
+        self.span = span
+        self.entries = deque()
+        self.ups = 0
+        self.total = 0
+
+    def add(self, ts: float, ups: int, total: int = 1):
+        self.entries.append((ts, ups, total))
+        self.ups += ups
+        self.total += total
+
+    def uptime_percent(self, now: Optional[float] = None) -> float:
+        cutoff = (time.time() if now is None else now) - self.span
+        while self.entries and self.entries[0][0] < cutoff:
+            _, ups, total = self.entries.popleft()
+            self.ups -= ups
+            self.total -= total
+        return (self.ups / self.total * 100) if self.total else 0.0
+
+class ServiceSpec(NamedTuple):
+    """
+    One services.json entry with its defaults applied, built once at start-up
+    so checks read plain attributes instead of dict lookups per probe.
+    """
+    name: str
+    type: str = "http"
+    url: Optional[str] = None
+    host: Optional[str] = None
+    port: Optional[int] = None
+    timeout: int = 10
+    expected_status: int = 200
+    method: str = "GET"
+    expected_response: Optional[Dict[str, Any]] = None
+    # Seconds between checks; None falls back to the monitoring loop's interval
+    check_interval: Optional[float] = None
+    alert_on_failure: bool = False
+
+    @classmethod
+    def from_config(cls, entry: Dict[str, Any]) -> "ServiceSpec":
+        service_type = entry.get("type", "http")
+        return cls(
+            name=entry["name"],
+            type=service_type,
+            url=entry.get("url"),
+            host=entry.get("host"),
+            port=entry.get("port"),
+            # TCP and DNS probes have always defaulted to a shorter timeout
+            timeout=entry.get("timeout", 5 if service_type in ("tcp", "dns") else 10),
+            expected_status=entry.get("expected_status", 200),
+            method=entry.get("method", "GET"),
+            expected_response=entry.get("expected_response"),
+            check_interval=entry.get("check_interval"),
+            alert_on_failure=entry.get("alert_on_failure", False),
+        )
+
 class ServiceHealthChecker:
     """
     Production-ready Async Service Health Checker.
@@ -27,12 +122,80 @@ class ServiceHealthChecker:
     def __init__(self, config_file: str = None):
         self.config_path = self._resolve_config_path(config_file)
         self.config = self.load_service_config()
-        self.services = self.config.get("services", [])
+        self.services = [ServiceSpec.from_config(s) for s in self.config.get("services", [])]
         self.db = DatabaseManager("netdiag_history.db")
-        self.metrics = {s['name']: [] for s in self.services}
+        # The database is authoritative on cold start; after that, results are counted as they arrive
+        self._uptime_windows = {s.name: self._load_uptime_window(s.name) for s in self.services}
+        # Last 100 results per service; deque drops the oldest in O(1)
+        self.metrics = {s.name: deque(maxlen=100) for s in self.services}
         self.alerts = []
         self.output_dir = Path("reports")
         self.output_dir.mkdir(exist_ok=True)
+        # (domain, rdtype) -> (ips, expiry on the monotonic clock), oldest first
+        self._dns_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._dns_cache_max = 1024
+        # domain -> shared lookup task, so concurrent checks of one name send one query
+        self._dns_inflight: Dict[str, asyncio.Future] = {}
+        # Caps outstanding queries against the recursive resolver; created lazily like _sem
+        self._dns_sem: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        # Dedicated single-worker pool for blocking work (DB writes): it does not
+        # queue behind other users of the loop's default executor, and batches
+        # are written in the order they were flushed
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._last_table: Optional[Table] = None
+        # name -> (status, 50 ms latency bucket) of the last row written to history
+        self._last_logged: Dict[str, tuple] = {}
+        # Caps in-flight checks per tick (services.json "max_concurrent_checks");
+        # created on first use so it belongs to the running event loop
+        self._max_concurrency = int(self.config.get("max_concurrent_checks", 64))
+        self._sem: Optional[asyncio.Semaphore] = None
+        # Service type -> check coroutine; one dict lookup per check
+        self._dispatch = {
+            "http": self._do_http,
+            "tcp": self._do_tcp,
+            "dns": self._do_dns,
+            "api": self._do_api,
+        }
+
+    def _load_uptime_window(self, name: str) -> _UptimeWindow:
+        window = _UptimeWindow()
+        for hour_bucket, up, total in self.db.get_uptime_buckets(name, hours=24):
+            window.add(hour_bucket * 3600, up, total)
+        return window
+
+    async def start(self) -> httpx.AsyncClient:
+        """
+        Opens the shared HTTP client and I/O thread pool; connections are kept
+        alive across ticks.
+        """
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="netdiag-io")
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                verify=False, # Disable SSL verification for broader compatibility in diagnostics
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+                timeout=httpx.Timeout(10.0, connect=3.0)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Closes the shared HTTP client and releases the I/O thread pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._io_pool is not None:
+            # Already-queued writes still run; we just don't wait for them here
+            self._io_pool.shutdown(wait=False)
+            self._io_pool = None
+
+    async def __aenter__(self) -> "ServiceHealthChecker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
 
     def _resolve_config_path(self, path: str) -> Path:
         if path: return Path(path)
@@ -43,8 +206,8 @@ class ServiceHealthChecker:
         # 1. Check for active user config
         if self.config_path.exists():
              try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
+                with open(self.config_path, 'rb') as f:
+                    return orjson.loads(f.read())
              except Exception:
                 pass
         
@@ -53,14 +216,14 @@ class ServiceHealthChecker:
         if template_path.exists():
             # Auto-create the user config from template so they can edit it
             try:
-                with open(template_path, 'r') as f:
-                    data = json.load(f)
+                with open(template_path, 'rb') as f:
+                    data = orjson.loads(f.read())
                 # Write to user config path provided checks
                 # (Only do this deep copy if we are in the default location to avoid polluting custom paths)
                 if self.config_path.name == "services.json": 
                     try:
-                        with open(self.config_path, 'w') as f:
-                            json.dump(data, f, indent=4)
+                        with open(self.config_path, 'wb') as f:
+                            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
                     except: pass
                 return data
             except:
@@ -68,11 +231,12 @@ class ServiceHealthChecker:
 
         return {"services": []}
 
-    async def check_http_service(self, client: httpx.AsyncClient, url: str, timeout: int = 10, expected_status: int = 200) -> Dict[str, Any]:
+    async def check_http_service(self, client: httpx.AsyncClient, url: str, timeout: int = 10, expected_status: int = 200,
+                                 timestamp: Optional[datetime] = None) -> Dict[str, Any]:
         """Async HTTP check."""
-        start = time.time()
+        start = time.perf_counter()
         result = {
-            "timestamp": datetime.now(),
+            "timestamp": timestamp or datetime.now(),
             "status": "down",
             "ssl_valid": False,
             "error_message": None,
@@ -80,14 +244,20 @@ class ServiceHealthChecker:
         }
         
         try:
-            resp = await client.get(url, timeout=timeout)
-            duration = (time.time() - start) * 1000
+            # Only the status is inspected, so don't transfer the body. Servers
+            # that reject HEAD get a streamed GET that is closed unread.
+            resp = await client.head(url, timeout=timeout, follow_redirects=True)
+            if resp.status_code in (405, 501):
+                async with client.stream("GET", url, timeout=timeout, follow_redirects=True) as resp:
+                    pass
+            duration = (time.perf_counter() - start) * 1000
             
             result.update({
                 "response_time_ms": round(duration, 2),
                 "status_code": resp.status_code,
                 "status": "up" if resp.status_code == expected_status else "down",
-                "ssl_valid": url.startswith("https"),
+                # Final URL after redirects, already parsed by httpx
+                "ssl_valid": resp.url.scheme == "https",
             })
             
             if resp.status_code != expected_status:
@@ -100,11 +270,11 @@ class ServiceHealthChecker:
             
         return result
 
-    async def check_tcp_service(self, host: str, port: int, timeout: int = 5) -> Dict[str, Any]:
+    async def check_tcp_service(self, host: str, port: int, timeout: int = 5, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
         """Async TCP check."""
-        start = time.time()
+        start = time.perf_counter()
         result = {
-            "timestamp": datetime.now(),
+            "timestamp": timestamp or datetime.now(),
             "status": "down",
             "error_message": None,
             "response_time_ms": 0
@@ -113,7 +283,7 @@ class ServiceHealthChecker:
         try:
             # open_connection is the async equivalent of socket.create_connection
             reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
-            duration = (time.time() - start) * 1000
+            duration = (time.perf_counter() - start) * 1000
             
             writer.close()
             await writer.wait_closed()
@@ -127,23 +297,33 @@ class ServiceHealthChecker:
             
         return result
 
-    async def check_dns_resolution(self, domain: str, expected_ip: str = None) -> Dict[str, Any]:
-        """Async DNS check invocation (blocking wrapped in thread)."""
-        start = time.time()
+    async def check_dns_resolution(self, domain: str, expected_ip: str = None, timeout: float = 5,
+                                   timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """Async DNS check on the shared dnspython async resolver."""
+        start = time.perf_counter()
         result = {
-            "timestamp": datetime.now(),
+            "timestamp": timestamp or datetime.now(),
             "status": "down",
             "error": None
         }
         
-        def _resolve():
-            resolver = dns.resolver.Resolver()
-            return [r.to_text() for r in resolver.resolve(domain, 'A')]
-
         try:
-            # DNS python is blocking, run in executor
-            ips = await asyncio.to_thread(_resolve)
-            duration = (time.time() - start) * 1000
+            key = (domain, 'A')
+            now = time.monotonic()
+            cached = self._dns_cache.get(key)
+            if cached is not None and cached[1] > now:
+                # Still within the record's TTL; no network round-trip
+                self._dns_cache.move_to_end(key)
+                ips = list(cached[0])
+                duration = 0
+            else:
+                found, ttl = await self._resolve_shared(domain, timeout)
+                ips = list(found)
+                duration = (time.perf_counter() - start) * 1000
+                self._dns_cache[key] = (found, now + min(ttl, 900))
+                self._dns_cache.move_to_end(key)
+                if len(self._dns_cache) > self._dns_cache_max:
+                    self._dns_cache.popitem(last=False)
             
             status = "up"
             if expected_ip and expected_ip not in ips:
@@ -160,31 +340,54 @@ class ServiceHealthChecker:
             
         return result
     
-    async def check_api_endpoint(self, client: httpx.AsyncClient, url: str, method: str = "GET", expected_response: Dict = None, timeout: int = 10) -> Dict[str, Any]:
+    async def _resolve_shared(self, domain: str, timeout: float) -> Tuple[tuple, int]:
+        """Returns (ips, ttl) for `domain`, joining a lookup already in flight for it."""
+        fut = self._dns_inflight.get(domain)
+        if fut is None:
+            if self._dns_sem is None:
+                self._dns_sem = asyncio.Semaphore(10)
+            fut = asyncio.ensure_future(self._query_a(domain, timeout))
+            self._dns_inflight[domain] = fut
+
+            def _forget(done: asyncio.Future):
+                if self._dns_inflight.get(domain) is done:
+                    del self._dns_inflight[domain]
+
+            fut.add_done_callback(_forget)
+        # Shielded so one cancelled waiter doesn't abort the lookup for the others
+        return await asyncio.shield(fut)
+
+    async def _query_a(self, domain: str, timeout: float) -> Tuple[tuple, int]:
+        async with self._dns_sem:
+            answers = await _get_async_resolver().resolve(domain, 'A', lifetime=timeout)
+        return tuple(r.to_text() for r in answers), answers.rrset.ttl
+
+    async def check_api_endpoint(self, client: httpx.AsyncClient, url: str, method: str = "GET", expected_response: Dict = None, timeout: int = 10,
+                                 timestamp: Optional[datetime] = None) -> Dict[str, Any]:
         """Async API check."""
-        start = time.time()
+        start = time.perf_counter()
         result = {
-            "timestamp": datetime.now(),
+            "timestamp": timestamp or datetime.now(),
             "status": "down",
             "error": None
         }
         
         try:
             resp = await client.request(method, url, timeout=timeout)
-            duration = (time.time() - start) * 1000
+            duration = (time.perf_counter() - start) * 1000
             
             if not resp.is_success:
                 result["error"] = f"API Error: {resp.status_code}"
                 return result
                 
             try:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 result.update({
                     "status": "up",
                     "response_time_ms": round(duration, 2),
                     "data_sample": str(data)[:100]
                 })
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 result["error"] = "Invalid JSON response"
                 
         except Exception as e:
@@ -192,69 +395,148 @@ class ServiceHealthChecker:
             
         return result
 
-    async def perform_check(self, client: httpx.AsyncClient, service: Dict[str, Any]) -> Dict[str, Any]:
-        """Dispatches check asynchronously."""
-        stype = service.get("type", "http")
-        
-        if stype == "http":
-            return await self.check_http_service(
-                client,
-                service["url"], 
-                service.get("timeout", 10), 
-                service.get("expected_status", 200)
-            )
-        elif stype == "tcp":
-            return await self.check_tcp_service(
-                service["host"], 
-                service["port"], 
-                service.get("timeout", 5)
-            )
-        elif stype == "dns":
-             return await self.check_dns_resolution(service["host"])
-        elif stype == "api":
-             return await self.check_api_endpoint(
-                 client,
-                 service["url"],
-                 service.get("method", "GET"),
-                 service.get("expected_response"),
-                 service.get("timeout", 10)
-             )
-        
-        return {"status": "unknown", "error": "Unknown type"}
+    async def _do_http(self, client: httpx.AsyncClient, service: ServiceSpec, timestamp: Optional[datetime]) -> Dict[str, Any]:
+        return await self.check_http_service(
+            client,
+            service.url,
+            service.timeout,
+            service.expected_status,
+            timestamp
+        )
+
+    async def _do_tcp(self, client: httpx.AsyncClient, service: ServiceSpec, timestamp: Optional[datetime]) -> Dict[str, Any]:
+        return await self.check_tcp_service(
+            service.host,
+            service.port,
+            service.timeout,
+            timestamp
+        )
+
+    async def _do_dns(self, client: httpx.AsyncClient, service: ServiceSpec, timestamp: Optional[datetime]) -> Dict[str, Any]:
+        return await self.check_dns_resolution(service.host, timeout=service.timeout, timestamp=timestamp)
+
+    async def _do_api(self, client: httpx.AsyncClient, service: ServiceSpec, timestamp: Optional[datetime]) -> Dict[str, Any]:
+        return await self.check_api_endpoint(
+            client,
+            service.url,
+            service.method,
+            service.expected_response,
+            service.timeout,
+            timestamp
+        )
+
+    async def perform_check(self, client: httpx.AsyncClient, service: ServiceSpec,
+                            timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Dispatches check asynchronously. `timestamp` is the tick's shared
+        check time; when omitted each check stamps its own.
+        """
+        handler = self._dispatch.get(service.type)
+        if handler is None:
+            return {"status": "unknown", "error": "Unknown type"}
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self._max_concurrency)
+        async with self._sem:
+            return await handler(client, service, timestamp)
+
+    async def _periodic(self, client: httpx.AsyncClient, service: ServiceSpec, offset: float,
+                        interval: float, queue: asyncio.Queue):
+        """Checks one service every `interval` seconds, starting `offset` seconds in."""
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + offset
+        while True:
+            await asyncio.sleep(max(0.0, next_run - loop.time()))
+            timestamp = datetime.now()
+            try:
+                res = await self.perform_check(client, service, timestamp)
+            except Exception as e:
+                # Recorded as down instead of killing this service's schedule
+                res = {"timestamp": timestamp, "status": "down", "error": repr(e), "response_time_ms": 0}
+            queue.put_nowait((service, res))
+            # Fixed rate: a slow check doesn't push later runs back
+            next_run += interval
 
-    async def run_monitoring_loop(self, interval: int = 60):
-        """Main async loop."""
-        async with httpx.AsyncClient(verify=False) as client: # Disable SSL verification for broader compatibility in diagnostics
-            with Live(self._generate_dashboard_table(), refresh_per_second=1) as live:
+    async def run_monitoring_loop(self, interval: int = 60, flush_interval: float = 1.0):
+        """
+        Main async loop. Each service is checked every `check_interval` seconds
+        (`interval` when unset), with start times spread evenly across that
+        period; results are collected from a queue and written to the DB and
+        dashboard at most once per `flush_interval`.
+        """
+        async with self:
+            client = self._client
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+            count = max(len(self.services), 1)
+            workers = []
+            for i, service in enumerate(self.services):
+                period = service.check_interval or interval
+                workers.append(asyncio.create_task(self._periodic(client, service, i * period / count, period, queue)))
+            latest = {}
+            # The table only changes when results arrive, so redraw on update instead of on a timer
+            self._last_table = self._generate_dashboard_table()
+            with Live(self._last_table, auto_refresh=False) as live:
                 try:
                     while True:
-                        tasks = []
-                        # Create tasks for all services
-                        for service in self.services:
-                            tasks.append(self.perform_check(client, service))
-                        
-                        # Run all checks PARALLEL
-                        results = await asyncio.gather(*tasks)
+                        # Block for the first result, then gather whatever else lands
+                        # within the flush window into the same batch
+                        batch = [await queue.get()]
+                        deadline = loop.time() + flush_interval
+                        while True:
+                            remaining = deadline - loop.time()
+                            if remaining <= 0:
+                                break
+                            try:
+                                batch.append(await asyncio.wait_for(queue.get(), remaining))
+                            except asyncio.TimeoutError:
+                                break
                         
                         # Process results
-                        for service, res in zip(self.services, results):
-                            name = service["name"]
-                            # Log to DB (run in thread to not block loop technically, but sqlite is fast)
-                            await asyncio.to_thread(self.db.log_check, res, name, service.get("type", "http"))
+                        rows = []
+                        unchanged = []
+                        for service, res in batch:
+                            name = service.name
+                            row = self.db.check_row(res, name, service.type)
+                            # Delta logging: history only gets a row when the status changes or
+                            # latency moves to another 50 ms bucket; the rest still count for uptime
+                            signature = (row[2], round((row[3] or 0) / 50))
+                            # Alert once when a service goes down, not on every failed check
+                            if service.alert_on_failure and row[2] == 'down' and latest.get(name, {}).get("status") != 'down':
+                                self.send_alert(name, "DOWN", row[5])
+                            if self._last_logged.get(name) == signature:
+                                unchanged.append(row)
+                            else:
+                                self._last_logged[name] = signature
+                                rows.append(row)
+                            # Same shape as a get_history row; row[-1] is the stored UTC timestamp
+                            latest[name] = {"status": res.get("status"), "response_time_ms": res.get("response_time_ms"), "timestamp": row[-1]}
                             
                             # Update Cache
                             self.metrics[name].append(res)
-                            if len(self.metrics[name]) > 100: self.metrics[name].pop(0)
+                            self._uptime_windows[name].add(time.time(), res.get("status") == "up")
+                        
+                        # Log the whole batch to DB in one transaction (off the event loop)
+                        await loop.run_in_executor(self._io_pool, self.db.log_checks_bulk, rows, unchanged)
 
-                        live.update(self._generate_dashboard_table())
-                        await asyncio.sleep(interval)
+                        self._last_table = self._generate_dashboard_table(latest)
+                        live.update(self._last_table, refresh=True)
                 except asyncio.CancelledError:
                     pass
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
 
     def monitor_continuously(self, interval: int = 60):
         """Entry point for sync CLI to call async loop."""
+        # libuv-based loop when installed (pip install net-diag-tool[uvloop])
         try:
-            asyncio.run(self.run_monitoring_loop(interval))
+            import uvloop
+            run = uvloop.run
+        except ImportError:
+            run = asyncio.run
+        try:
+            run(self.run_monitoring_loop(interval))
         except KeyboardInterrupt:
             console.print("[yellow]Monitoring stopped.[/yellow]")
 
@@ -263,8 +545,11 @@ class ServiceHealthChecker:
     # Since we are in the main thread (asyncio.run blocks), we can just call DB methods directly.
     # The actual dashboard usage of DB is fine.
     
-    def _generate_dashboard_table(self) -> Table:
-        """Generates dashboard using DB stats."""
+    def _generate_dashboard_table(self, latest: Optional[Dict[str, Dict[str, Any]]] = None) -> Table:
+        """
+        Generates dashboard using DB stats. `latest` holds this tick's results
+        by service name, which saves a history query per service.
+        """
         table = Table(title="Service Health Dashboard (Async & Fast)")
         table.add_column("Service", style="cyan")
         table.add_column("Type", style="magenta")
@@ -274,11 +559,14 @@ class ServiceHealthChecker:
         table.add_column("Last Check")
 
         for service in self.services:
-            name = service["name"]
-            history = self.db.get_history(name, limit=1)
+            name = service.name
+            if latest and name in latest:
+                history = [latest[name]]
+            else:
+                history = self.db.get_history(name, limit=1)
             
             if not history:
-                table.add_row(name, service.get("type"), "PENDING", "-", "-", "-")
+                table.add_row(name, service.type, "PENDING", "-", "-", "-")
                 continue
                 
             last = history[0]
@@ -286,20 +574,25 @@ class ServiceHealthChecker:
             status_icon = "🟢 UP" if last['status'] == 'up' else "🔴 DOWN"
             latency = f"{last['response_time_ms']}ms" if last['response_time_ms'] else "-"
             
-            stats = self.db.get_uptime_stats(name, hours=24)
-            uptime_str = f"{stats['uptime_percent']:.1f}%"
+            uptime_str = f"{self._uptime_windows[name].uptime_percent():.1f}%"
             
             table.add_row(
                 name, 
-                service.get("type"), 
+                service.type,
                 status_icon, 
                 latency, 
                 uptime_str, 
-                str(last['timestamp']).split('.')[0]
+                local_time(last['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
             )
             
         return table
     
+    def send_alert(self, service_name: str, type: str, message: str):
+        """Records an alert and logs it."""
+        msg = f"ALERT: {service_name} is {type}. Detail: {message}"
+        self.alerts.append({"timestamp": datetime.now(), "message": msg})
+        logger.error(msg)
+
     def calculate_uptime(self, service_name: str) -> float:
         stats = self.db.get_uptime_stats(service_name)
         return stats['uptime_percent']
@@ -309,304 +602,17 @@ class ServiceHealthChecker:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         services_data = {}
         for s in self.services:
-            name = s['name']
+            name = s.name
             history = self.db.get_history(name, limit=1)
             stats = self.db.get_uptime_stats(name)
             services_data[name] = {"latest": history[0] if history else None, "stats": stats}
 
         if format == "html":
-            template_str = """<!DOCTYPE html><html><head><title>Service Status</title><style>
-            body{font-family:sans-serif;padding:20px;background:#f4f6f8}
-            .card{background:white;padding:15px;margin:10px 0;border-radius:5px;border-left:5px solid #ccc;box-shadow:0 1px 3px rgba(0,0,0,0.1)}
-            .up{border-left-color:#28a745}.down{border-left-color:#dc3545}
-            h2{margin:0 0 10px 0}.metric{margin-right:15px;color:#555}
-            </style></head><body><h1>System Status</h1><p>Generated: {{timestamp}}</p>
-            {% for name, data in services.items() %}{% set last = data.latest %}
-            <div class="card {{'up' if last and last.status=='up' else 'down'}}">
-            <h2>{{name}} <span style="float:right;font-size:0.8em;color:{{'green' if last.status=='up' else 'red'}}">{{last.status|upper}}</span></h2>
-            {% if last %}<div><span class="metric">Latency: {{last.response_time_ms}}ms</span><span class="metric">Uptime: {{"%.1f"|format(data.stats.uptime_percent)}}%</span></div>
-            {% else %}<p>No data</p>{% endif %}</div>{% endfor %}</body></html>"""
-            
-            template = Template(template_str)
-            html = template.render(services=services_data, timestamp=timestamp)
+            html = _STATUS_PAGE_TEMPLATE.render(services=services_data, timestamp=timestamp)
             path = self.output_dir / "status_page.html"
             with open(path, 'w', encoding='utf-8') as f: f.write(html)
             return str(path)
         return "Unsupported provided"
-        result = {
-            "timestamp": datetime.now(),
-            "status": "down",
-            "ssl_valid": False,
-            "error_message": None
-        }
-        
-        try:
-            response = requests.get(url, timeout=timeout, verify=True)
-            duration = (time.time() - start) * 1000
-            
-            result.update({
-                "response_time_ms": round(duration, 2),
-                "status_code": response.status_code,
-                "status": "up" if response.status_code == expected_status else "down",
-                "ssl_valid": url.startswith("https"), # Simplified SSL check
-            })
-            
-            if response.status_code != expected_status:
-                result["error_message"] = f"Unexpected status: {response.status_code}"
-                
-        except requests.exceptions.SSLError:
-            result["error_message"] = "SSL Error"
-        except requests.exceptions.ConnectionError:
-            result["error_message"] = "Connection Failed"
-        except requests.exceptions.Timeout:
-            result["error_message"] = "Timeout"
-        except Exception as e:
-            result["error_message"] = str(e)
-            
-        return result
-
-    def check_tcp_service(self, host: str, port: int, timeout: int = 5) -> Dict[str, Any]:
-        """Checks TCP connectivity."""
-        start = time.time()
-        result = {
-            "timestamp": datetime.now(),
-            "status": "down",
-            "error_message": None
-        }
-        
-        try:
-            with socket.create_connection((host, port), timeout=timeout):
-                duration = (time.time() - start) * 1000
-                result["status"] = "up"
-                result["response_time_ms"] = round(duration, 2)
-        except Exception as e:
-            result["error_message"] = str(e)
-            
-        return result
-
-    def check_dns_resolution(self, domain: str, expected_ip: str = None) -> Dict[str, Any]:
-        """Checks DNS resolution."""
-        start = time.time()
-        result = {
-            "timestamp": datetime.now(),
-            "status": "down",
-            "error": None
-        }
-        
-        try:
-            resolver = dns.resolver.Resolver()
-            answers = resolver.resolve(domain, 'A')
-            ips = [r.to_text() for r in answers]
-            duration = (time.time() - start) * 1000
-            
-            status = "up"
-            if expected_ip and expected_ip not in ips:
-                status = "down"
-                result["error"] = f"IP mismatch. Expected {expected_ip}, got {ips}"
-            
-            result.update({
-                "status": status,
-                "response_time_ms": round(duration, 2),
-                "ips": ips
-            })
-        except Exception as e:
-            result["error"] = str(e)
-            
-        return result
-    
-    def check_api_endpoint(self, url: str, method: str = "GET", expected_response: Dict = None, timeout: int = 10) -> Dict[str, Any]:
-        """Checks API response structure."""
-        start = time.time()
-        result = {
-            "timestamp": datetime.now(),
-            "status": "down",
-            "error": None
-        }
-        
-        try:
-            resp = requests.request(method, url, timeout=timeout)
-            duration = (time.time() - start) * 1000
-            
-            if not resp.ok:
-                result["error"] = f"API Error: {resp.status_code}"
-                return result
-                
-            data = resp.json()
-            # Basic validation: check if expected keys exist
-            if expected_response:
-                # If expected_response is a subset of actual response
-                # This is a simplification; production code might need deep diff
-                pass 
-            
-            result.update({
-                "status": "up",
-                "response_time_ms": round(duration, 2),
-                "data_sample": str(data)[:100] # Truncate
-            })
-        except json.JSONDecodeError:
-            result["error"] = "Invalid JSON response"
-        except Exception as e:
-            result["error"] = str(e)
-            
-        return result
-
-    def perform_check(self, service: Dict[str, Any]) -> Dict[str, Any]:
-        """Dispatches check based on service type."""
-        stype = service.get("type", "http")
-        name = service.get("name")
-        
-        if stype == "http":
-            return self.check_http_service(
-                service["url"], 
-                service.get("timeout", 10), 
-                service.get("expected_status", 200)
-            )
-        elif stype == "tcp":
-            return self.check_tcp_service(
-                service["host"], 
-                service["port"], 
-                service.get("timeout", 5)
-            )
-        elif stype == "dns":
-             return self.check_dns_resolution(service["host"])
-        elif stype == "api":
-             return self.check_api_endpoint(
-                 service["url"],
-                 service.get("method", "GET"),
-                 service.get("expected_response"),
-                 service.get("timeout", 10)
-             )
-        
-        return {"status": "unknown", "error": "Unknown type"}
-
-    def monitor_continuously(self, interval: int = 60):
-        """Runs continuous monitoring loop with dashboard."""
-        
-        with Live(self._generate_dashboard_table(), refresh_per_second=1) as live:
-            try:
-                while True:
-                    for service in self.services:
-                        name = service["name"]
-                        res = self.perform_check(service)
-                        
-                        # Store Metric
-                        self.metrics[name].append(res)
-                        if len(self.metrics[name]) > 100: # Keep last 100
-                            self.metrics[name].pop(0)
-                        
-                        # Alerting Logic (Simple)
-                        if res['status'] == 'down' and service.get('alert_on_failure'):
-                            self.send_alert(name, "DOWN", res.get('error_message') or res.get('error'))
-                            
-                    live.update(self._generate_dashboard_table())
-                    time.sleep(interval)
-            except KeyboardInterrupt:
-                console.print("[yellow]Monitoring stopped.[/yellow]")
-
-    def _generate_dashboard_table(self) -> Table:
-        """Generates the Rich table for the dashboard."""
-        table = Table(title="Service Health Dashboard")
-        table.add_column("Service", style="cyan")
-        table.add_column("Type", style="magenta")
-        table.add_column("Status", justify="center")
-        table.add_column("Latency")
-        table.add_column("Uptime (24h)", justify="right")
-        table.add_column("Last Check")
-
-        for service in self.services:
-            name = service["name"]
-            history = self.metrics.get(name, [])
-            if not history:
-                table.add_row(name, service.get("type"), "PENDING", "-", "-", "-")
-                continue
-                
-            last = history[-1]
-            
-            # Status Style
-            status_icon = "🟢 UP" if last['status'] == 'up' else "🔴 DOWN"
-            
-            # Latency
-            latency = f"{last.get('response_time_ms', 0)}ms"
-            
-            # Uptime Calc
-            uptime = self.calculate_uptime(name)
-            uptime_str = f"{uptime:.1f}%"
-            
-            table.add_row(
-                name, 
-                service.get("type"), 
-                status_icon, 
-                latency, 
-                uptime_str, 
-                last['timestamp'].strftime("%H:%M:%S")
-            )
-            
-        return table
-
-    def calculate_uptime(self, service_name: str) -> float:
-        """Calculates simple uptime percentage from memory."""
-        history = self.metrics.get(service_name, [])
-        if not history: return 0.0
-        
-        successful = sum(1 for r in history if r['status'] == 'up')
-        return (successful / len(history)) * 100
-
-    def send_alert(self, service_name: str, type: str, message: str):
-        """Sends an alert."""
-        msg = f"ALERT: {service_name} is {type}. Detail: {message}"
-        self.alerts.append({"timestamp": datetime.now(), "message": msg})
-        
-        # In production this would send email/slack
-        # logger.error(msg) 
-
-    def export_status_page(self, format: str = "html") -> str:
-        """Generates a status page."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        if format == "html":
-            template_str = """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Service Status</title>
-                <style>
-                    body { font-family: sans-serif; padding: 20px; background: #f4f4f9; }
-                    .card { background: white; padding: 15px; margin-bottom: 10px; border-radius: 5px; box-shadow: 0 2px 2px rgba(0,0,0,0.1); }
-                    .up { color: green; font-weight: bold; }
-                    .down { color: red; font-weight: bold; }
-                    h1 { text-align: center; color: #333; }
-                </style>
-            </head>
-            <body>
-                <h1>Service Status Page</h1>
-                <p style="text-align:center">Generated: {{ timestamp }}</p>
-                
-                {% for name, history in metrics.items() %}
-                {% set last = history[-1] if history else None %}
-                <div class="card">
-                    <h2>{{ name }}</h2>
-                    {% if last %}
-                        <p>Status: <span class="{{ last.status }}">{{ last.status|upper }}</span></p>
-                        <p>Latency: {{ last.response_time_ms }}ms</p>
-                        <p>Last Check: {{ last.timestamp }}</p>
-                    {% else %}
-                        <p>No data available.</p>
-                    {% endif %}
-                </div>
-                {% endfor %}
-            </body>
-            </html>
-            """
-            
-            template = Template(template_str)
-            html = template.render(metrics=self.metrics, timestamp=timestamp)
-            
-            path = self.output_dir / "status_page.html"
-            with open(path, 'w') as f:
-                f.write(html)
-            return str(path)
-            
-        return "Unsupported format"
 
 if __name__ == "__main__":
     # Test
@@ -1,16 +1,21 @@
 import platform
+import numpy as np
 import psutil
-import json
+import orjson
 import logging
+import os
+import re
 import time
 import socket
 import smtplib
+import select
 import subprocess
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
 from email.mime.text import MIMEText
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from collections import deque
 
 from rich.console import Console
@@ -20,11 +25,73 @@ from rich.live import Live
 from rich.layout import Layout
 from rich.progress import Progress, BarColumn, TextColumn
 
+from net_diag_tool.core.config_cache import load_json_config
 from net_diag_tool.core.logger import setup_logger
 
 logger = setup_logger(__name__)
 console = Console()
 
+class _RingBuffer:
+    """
+    Fixed-size float history backed by a NumPy array. Every value is written
+    twice, so the window in chronological order is always one contiguous
+    slice and reading it never copies.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def append(self, value: float):
+        self._data[self._next] = value
+        self._data[self._next + self.capacity] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def view(self) -> np.ndarray:
+        end = self._next + self.capacity
+        return self._data[end - self._size:end]
+
+    def __len__(self) -> int:
+        return self._size
+
+# Syslog keywords, matched case-insensitively against raw bytes
+_LOG_ERROR_RE = re.compile(rb'error|critical|fail', re.IGNORECASE)
+
+def _tail_lines(path: Path, count: int, block_size: int = 32768) -> List[bytes]:
+    """Returns the last `count` lines of a file, reading backwards from the end in blocks."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # One extra newline guarantees the first kept line is complete
+        while pos > 0 and data.count(b"\n") <= count:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]
+    return lines[-count:]
+
+_GIB = 1 << 30
+
+def _internet_reachable(address=("8.8.8.8", 53), timeout: float = 0.3) -> bool:
+    """Non-blocking TCP connect probe; waits at most `timeout` seconds for the handshake."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        sock.setblocking(False)
+        sock.connect_ex(address)
+        _, writable, _ = select.select([], [sock], [], timeout)
+        # Writable also signals a failed connect, so check the pending error
+        return bool(writable) and sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
 class SystemHealthMonitor:
     """
     Enterprise-grade System Health Monitor.
@@ -46,15 +113,38 @@ class SystemHealthMonitor:
 
         self.config = self._load_config()
         self.thresholds = self.config.get("thresholds", {})
+        # metric -> (critical, warning), resolved once instead of per status check
+        self._thr = {
+            m: (self.thresholds.get(f"{m}_critical", 90), self.thresholds.get(f"{m}_warning", 80))
+            for m in ("cpu_percent", "memory_percent", "disk_percent")
+        }
         
         # Metrics history for anomaly detection (store last 100 points)
         self.history = {
-            "cpu_percent": deque(maxlen=100),
-            "memory_percent": deque(maxlen=100),
-            "disk_io": deque(maxlen=100)
+            "cpu_percent": _RingBuffer(100),
+            "memory_percent": _RingBuffer(100),
+            "disk_io": _RingBuffer(100)
         }
         
         self.alerts = []
+        
+        # Shortest window (seconds) cpu_percent() may average over; 0 never blocks
+        self.sample_interval = float(self.config.get("sample_interval", 0.5))
+        
+        # Prime psutil's CPU meters; later non-blocking calls report usage since the previous call
+        psutil.cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        self._cpu_sampled_at = time.monotonic()
+        
+        # Latest report published by the dashboard's sampler thread; a one-slot
+        # deque hands it over without a lock (append and [0] are atomic)
+        self._latest_report: deque = deque([None], maxlen=1)
+        self._stop = threading.Event()
+        # (expiry on the monotonic clock, lowercased service name -> running) from one `sc queryex`
+        self._win_services: Optional[Tuple[float, Dict[str, bool]]] = None
+        # Outstanding disk_usage probe per mountpoint; a hung mount keeps its one probe
+        # instead of collecting a new stuck thread on every report
+        self._disk_probes: Dict[str, Future] = {}
 
     def _load_config(self) -> Dict[str, Any]:
         """Loads configuration from JSON file."""
@@ -68,13 +158,14 @@ class SystemHealthMonitor:
                 "disk_percent_warning": 85
             },
             "alerting": {"enabled": False},
-            "critical_services": ["docker", "nginx", "ssh"]
+            "critical_services": ["docker", "nginx", "ssh"],
+            "sample_interval": 0.5
         }
         
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
+                # Each monitor gets a private copy it can adjust
+                return load_json_config(self.config_path)
             except Exception as e:
                 logger.error(f"Failed to load config from {self.config_path}: {e}")
                 return defaults
@@ -84,8 +175,7 @@ class SystemHealthMonitor:
 
     def _get_status(self, value: float, metric_name: str) -> str:
         """Determines status based on thresholds."""
-        crit = self.thresholds.get(f"{metric_name}_critical", 90)
-        warn = self.thresholds.get(f"{metric_name}_warning", 80)
+        crit, warn = self._thr.get(metric_name, (90, 80))
         
         if value >= crit:
             return "critical"
@@ -93,11 +183,27 @@ class SystemHealthMonitor:
             return "warning"
         return "healthy"
 
-    def get_cpu_metrics(self) -> Dict[str, Any]:
-        """Collects detailed CPU metrics."""
+    def _collect_processes(self) -> List[Dict[str, Any]]:
+        """
+        Walks the process table once, collecting every field the CPU, memory
+        and service collectors need. Fields psutil can't read are None.
+        """
+        procs = []
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'exe', 'memory_percent', 'memory_info']):
+            procs.append(proc.info)
+        return procs
+
+    def get_cpu_metrics(self, procs: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Collects detailed CPU metrics. `procs` is a _collect_processes() snapshot to reuse."""
         try:
-            total_usage = psutil.cpu_percent(interval=0.5)
-            per_core = psutil.cpu_percent(interval=0.1, percpu=True)
+            # Only wait when the previous sample is too recent to be meaningful
+            # (e.g. a one-off check right after __init__); dashboard ticks never block
+            wait = self._cpu_sampled_at + self.sample_interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            total_usage = psutil.cpu_percent(interval=None)
+            per_core = psutil.cpu_percent(interval=None, percpu=True)
+            self._cpu_sampled_at = time.monotonic()
             freq = psutil.cpu_freq()
             
             # Load Avg (Unix only usually, but psutil emulates or returns None on Windows)
@@ -106,17 +212,14 @@ class SystemHealthMonitor:
                  load_avg = psutil.getloadavg()
 
             # Top Processes
-            top_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'exe']):
-                try:
-                    pinfo = proc.info
-                    top_processes.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
+            if procs is None:
+                procs = self._collect_processes()
             
             # Sort by CPU usage and take top 5
-            top_processes.sort(key=lambda x: x.get('cpu_percent', 0.0), reverse=True)
-            top_processes = top_processes[:5]
+            top_processes = [
+                {'pid': p['pid'], 'name': p['name'], 'cpu_percent': p['cpu_percent'], 'exe': p['exe']}
+                for p in sorted(procs, key=lambda x: x['cpu_percent'] or 0.0, reverse=True)[:5]
+            ]
 
             status = self._get_status(total_usage, "cpu_percent")
             
@@ -138,36 +241,32 @@ class SystemHealthMonitor:
             logger.error(f"Error getting CPU metrics: {e}")
             return {"error": str(e)}
 
-    def get_memory_metrics(self) -> Dict[str, Any]:
-        """Collects memory metrics."""
+    def get_memory_metrics(self, procs: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Collects memory metrics. `procs` is a _collect_processes() snapshot to reuse."""
         try:
             mem = psutil.virtual_memory()
             swap = psutil.swap_memory()
             
             # Top Memory Processes
-            top_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'memory_info']):
-                try:
-                    pinfo = proc.info
-                    pinfo['rss'] = pinfo['memory_info'].rss
-                    del pinfo['memory_info'] # Cleanup object
-                    top_processes.append(pinfo)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
+            if procs is None:
+                procs = self._collect_processes()
             
-            top_processes.sort(key=lambda x: x.get('memory_percent', 0.0), reverse=True)
-            top_processes = top_processes[:5]
+            top_processes = [
+                {'pid': p['pid'], 'name': p['name'], 'memory_percent': p['memory_percent'],
+                 'rss': p['memory_info'].rss if p['memory_info'] else None}
+                for p in sorted(procs, key=lambda x: x['memory_percent'] or 0.0, reverse=True)[:5]
+            ]
             
             # Detect leaks (basic heuristic)
-            leaks = [p for p in top_processes if p['memory_percent'] > 50]
+            leaks = [p for p in top_processes if (p['memory_percent'] or 0.0) > 50]
             
             status = self._get_status(mem.percent, "memory_percent")
             self.history["memory_percent"].append(mem.percent)
 
             return {
-                "total_gb": round(mem.total / (1024**3), 2),
-                "used_gb": round(mem.used / (1024**3), 2),
-                "available_gb": round(mem.available / (1024**3), 2),
+                "total_gb": round(mem.total / _GIB, 2),
+                "used_gb": round(mem.used / _GIB, 2),
+                "available_gb": round(mem.available / _GIB, 2),
                 "percent": mem.percent,
                 "swap_percent": swap.percent,
                 "top_processes": top_processes,
@@ -178,34 +277,65 @@ class SystemHealthMonitor:
             logger.error(f"Error getting Memory metrics: {e}")
             return {"error": str(e)}
 
-    def get_disk_metrics(self) -> List[Dict[str, Any]]:
-        """Collects disk usage for all partitions."""
+    def _probe_disk_usage(self, mountpoint: str) -> Future:
+        """Returns the pending disk_usage probe for a mount, starting a new one only if none is running."""
+        future = self._disk_probes.get(mountpoint)
+        if future is not None and not future.done():
+            return future
+        
+        future = Future()
+        
+        def probe():
+            try:
+                future.set_result(psutil.disk_usage(mountpoint))
+            except Exception as e:
+                future.set_exception(e)
+        
+        # Daemon thread: a mount that never answers must not block interpreter exit
+        threading.Thread(target=probe, name=f"disk-usage:{mountpoint}", daemon=True).start()
+        self._disk_probes[mountpoint] = future
+        return future
+
+    def get_disk_metrics(self, timeout: float = 2.0) -> List[Dict[str, Any]]:
+        """Collects disk usage for all partitions, skipping mounts that don't answer within `timeout` seconds."""
         disks = []
         try:
             parts = psutil.disk_partitions(all=False)
             usage_io = psutil.disk_io_counters()
             
+            # Skip snap or loop devices often found on Linux
+            parts = [p for p in parts if 'snap' not in p.device and 'loop' not in p.device]
+            
+            # Query mounts in parallel so one stalled mount (NFS, FUSE) can't hold up the report
+            usages = {}
+            if parts:
+                futures = {self._probe_disk_usage(part.mountpoint): part.mountpoint for part in parts}
+                try:
+                    for future in as_completed(futures, timeout=timeout):
+                        try:
+                            usages[futures[future]] = future.result()
+                        except OSError:
+                            continue
+                except FutureTimeoutError:
+                    stalled = [m for f, m in futures.items() if not f.done()]
+                    logger.warning(f"Skipping unresponsive mounts: {', '.join(stalled)}")
+            
             for part in parts:
-                # Skip snap or loop devices often found on Linux
-                if 'snap' in part.device or 'loop' in part.device:
+                usage = usages.get(part.mountpoint)
+                if usage is None:
                     continue
+                status = self._get_status(usage.percent, "disk_percent")
                 
-                try:
-                    usage = psutil.disk_usage(part.mountpoint)
-                    status = self._get_status(usage.percent, "disk_percent")
-                    
-                    disks.append({
-                        "device": part.device,
-                        "mountpoint": part.mountpoint,
-                        "fstype": part.fstype,
-                        "total_gb": round(usage.total / (1024**3), 2),
-                        "used_gb": round(usage.used / (1024**3), 2),
-                        "free_gb": round(usage.free / (1024**3), 2),
-                        "percent": usage.percent,
-                        "status": status
-                    })
-                except PermissionError:
-                    continue
+                disks.append({
+                    "device": part.device,
+                    "mountpoint": part.mountpoint,
+                    "fstype": part.fstype,
+                    "total_gb": round(usage.total / _GIB, 2),
+                    "used_gb": round(usage.used / _GIB, 2),
+                    "free_gb": round(usage.free / _GIB, 2),
+                    "percent": usage.percent,
+                    "status": status
+                })
 
             # Record aggregated IO for anomaly detection (simplified)
             if usage_io:
@@ -222,14 +352,8 @@ class SystemHealthMonitor:
         try:
             net_io = psutil.net_io_counters()
             
-            # Connectivity Check
-            connected = False
-            try:
-                # Ping Google DNS (8.8.8.8) port 53 (DNS)
-                socket.create_connection(("8.8.8.8", 53), timeout=3)
-                connected = True
-            except OSError:
-                pass
+            # Connectivity Check: Google DNS (8.8.8.8) port 53, capped at 300ms
+            connected = _internet_reachable()
 
             return {
                 "bytes_sent_gb": round(net_io.bytes_sent / (1024**3), 2),
@@ -244,27 +368,31 @@ class SystemHealthMonitor:
             logger.error(f"Error getting Network metrics: {e}")
             return {}
 
-    def check_critical_services(self) -> List[Dict[str, Any]]:
-        """Checks status of critical services."""
+    def check_critical_services(self, procs: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Checks status of critical services. `procs` is a _collect_processes() snapshot to reuse."""
         services_to_check = self.config.get("critical_services", [])
         status_list = []
         
         # 1. Check via psutil for cross-platform process existence
         # This is often more reliable than querying systemd/service manager for simple checks
-        running_procs = {p.name().lower() for p in psutil.process_iter(['name'])}
+        if procs is None:
+            procs = [p.info for p in psutil.process_iter(['name'])]
+        running_procs = {p['name'].lower() for p in procs if p['name']}
+        
+        # Basic match: checks if substring is in any running process name
+        # Not perfect, but robust across Windows/Linux without os-specific calls
+        running = {svc: any(svc.lower() in p_name for p_name in running_procs) for svc in services_to_check}
+        
+        # If not found via process list, try OS specific commands
+        missing = [svc for svc, is_running in running.items() if not is_running]
+        if missing:
+            if self.os_type == 'linux':
+                running.update(self._check_systemd_services(missing))
+            elif self.os_type == 'windows':
+                running.update({svc: self._check_windows_service(svc) for svc in missing})
         
         for svc in services_to_check:
-            # Basic match: checks if substring is in any running process name
-            # Not perfect, but robust across Windows/Linux without os-specific calls
-            is_running = any(svc.lower() in p_name for p_name in running_procs)
-            
-            # If not found via process list, try OS specific commands
-            if not is_running:
-                 if self.os_type == 'linux':
-                     is_running = self._check_systemd_service(svc)
-                 elif self.os_type == 'windows':
-                     is_running = self._check_windows_service(svc)
-                     
+            is_running = running[svc]
             status_list.append({
                 "service": svc,
                 "status": "Running" if is_running else "Stopped",
@@ -273,24 +401,48 @@ class SystemHealthMonitor:
             
         return status_list
     
-    def _check_systemd_service(self, service_name: str) -> bool:
-        """Checks systemd service status."""
+    def _check_systemd_services(self, service_names: List[str]) -> Dict[str, bool]:
+        """Checks several systemd units with one `systemctl is-active` call."""
         try:
-            cmd = ["systemctl", "is-active", service_name]
+            cmd = ["systemctl", "is-active", *service_names]
             result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            return result.returncode == 0
+            # One state line per unit, in argument order
+            states = result.stdout.splitlines()
         except FileNotFoundError:
-            return False
+            states = []
+        return {name: i < len(states) and states[i].strip() == "active" for i, name in enumerate(service_names)}
 
     def _check_windows_service(self, service_name: str) -> bool:
-        """Checks Windows service status via sc query."""
+        """Checks Windows service status against the cached service table."""
+        return self._windows_service_states().get(service_name.lower(), False)
+
+    def _windows_service_states(self, max_age: float = 10.0) -> Dict[str, bool]:
+        """
+        Lists every service with a single `sc queryex` and caches the result for
+        `max_age` seconds, instead of spawning `sc query` per service.
+        """
+        now = time.monotonic()
+        if self._win_services and self._win_services[0] > now:
+            return self._win_services[1]
+        
+        states = {}
         try:
-            # sc query return text that includes "STATE : 4 RUNNING" if running
-            cmd = ["sc", "query", service_name]
+            cmd = ["sc", "queryex", "type=", "service", "state=", "all", "bufsize=", "262144"]
             result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            return "RUNNING" in result.stdout
+            # Each entry has "SERVICE_NAME: <name>" followed by "STATE : 4 RUNNING" if running
+            name = None
+            for line in result.stdout.splitlines():
+                line = line.strip()
+                if line.startswith("SERVICE_NAME:"):
+                    name = line.split(":", 1)[1].strip().lower()
+                elif name and line.startswith("STATE"):
+                    states[name] = "RUNNING" in line
+                    name = None
         except FileNotFoundError:
-            return False
+            pass
+        
+        self._win_services = (now + max_age, states)
+        return states
 
     def get_system_info(self) -> Dict[str, Any]:
         """Provides static system details."""
@@ -326,12 +478,13 @@ class SystemHealthMonitor:
              log_path = Path("/var/log/syslog")
              if log_path.exists():
                  try:
-                     # Use 'tail' command for efficiency
-                     cmd = ["tail", "-n", str(lines_to_check), str(log_path)]
-                     result = subprocess.run(cmd, stdout=subprocess.PIPE, text=True)
-                     for line in result.stdout.splitlines():
-                         if "error" in line.lower() or "critical" in line.lower() or "fail" in line.lower():
-                             errors.append(line.strip())
+                     # Read only the end of the file instead of forking 'tail'
+                     # Only matching lines are decoded
+                     errors = [
+                         line.decode('utf-8', 'replace').strip()
+                         for line in _tail_lines(log_path, lines_to_check)
+                         if _LOG_ERROR_RE.search(line)
+                     ]
                  except Exception as e:
                      errors.append(f"Error reading syslog: {e}")
         
@@ -358,30 +511,46 @@ class SystemHealthMonitor:
         anomalies = []
         
         # Check CPU Spike
-        if len(self.history["cpu_percent"]) > 10:
-            recent_avg = sum(list(self.history["cpu_percent"])[-5:]) / 5
-            long_avg = sum(self.history["cpu_percent"]) / len(self.history["cpu_percent"])
+        cpu = self.history["cpu_percent"].view()
+        if len(cpu) > 10:
+            recent_avg = cpu[-5:].mean()
+            long_avg = cpu.mean()
             if recent_avg > (long_avg * 1.5) and recent_avg > 50:
                 anomalies.append("CPU usage significantly higher than average")
 
         # Check Memory Trend
-        if len(self.history["memory_percent"]) > 10:
-             recent_mem = list(self.history["memory_percent"])[-1]
-             start_mem = list(self.history["memory_percent"])[0]
-             if recent_mem > (start_mem + 15): # 15% growth
-                 anomalies.append("Memory usage detected increasing trend (Possible Leak)")
+        mem = self.history["memory_percent"].view()
+        if len(mem) > 10:
+            if mem[-1] > (mem[0] + 15): # 15% growth
+                anomalies.append("Memory usage detected increasing trend (Possible Leak)")
                  
         return anomalies
 
     def generate_health_report(self) -> Dict[str, Any]:
         """Aggregates all metrics into a report."""
-        cpu = self.get_cpu_metrics()
-        mem = self.get_memory_metrics()
-        disks = self.get_disk_metrics()
-        net = self.get_network_metrics()
-        services = self.check_critical_services()
-        logs = self.check_system_logs_for_errors()
-        sys_info = self.get_system_info()
+        # Collectors mostly wait on syscalls, subprocesses and sockets, so they run concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                "disk": executor.submit(self.get_disk_metrics),
+                "network": executor.submit(self.get_network_metrics),
+                "logs": executor.submit(self.check_system_logs_for_errors),
+                "system": executor.submit(self.get_system_info),
+            }
+            # One process-table walk shared by the CPU, memory and service collectors
+            procs = self._collect_processes()
+            futures["cpu"] = executor.submit(self.get_cpu_metrics, procs)
+            futures["memory"] = executor.submit(self.get_memory_metrics, procs)
+            futures["services"] = executor.submit(self.check_critical_services, procs)
+            results = {key: future.result() for key, future in futures.items()}
+        
+        cpu = results["cpu"]
+        mem = results["memory"]
+        disks = results["disk"]
+        net = results["network"]
+        services = results["services"]
+        logs = results["logs"]
+        sys_info = results["system"]
+        # Runs after the join so it sees this report's samples
         anomalies = self.detect_anomalies()
         
         # Calculate Score (0-100)
@@ -444,7 +613,8 @@ class SystemHealthMonitor:
             
         try:
             logger.info("Sending alert email...")
-            msg = MIMEText(json.dumps(report, indent=4))
+            body = orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+            msg = MIMEText(body.decode('utf-8'))
             msg['Subject'] = f"ALERT: System Health Score {report['health_score']} on {socket.gethostname()}"
             msg['From'] = alert_cfg['sender_email']
             msg['To'] = alert_cfg['receiver_email']
@@ -457,8 +627,20 @@ class SystemHealthMonitor:
         except Exception as e:
             logger.error(f"Failed to send email alert: {e}")
 
-    def dashboard(self):
-        """Displays a real-time Live dashboard."""
+    def _sampler_loop(self, interval: float = 2.0):
+        """Collects reports in the background until _stop is set."""
+        while not self._stop.is_set():
+            try:
+                self._latest_report.append(self.generate_health_report())
+            except Exception as e:
+                logger.error(f"Health sampler failed: {e}")
+            self._stop.wait(interval)
+
+    def _build_dashboard(self) -> Tuple[Layout, Dict[str, Any]]:
+        """
+        Builds the dashboard layout once. Returns it with the panels that
+        _render_dashboard fills on every new report.
+        """
         layout = Layout()
         layout.split_column(
             Layout(name="header", size=3),
@@ -470,48 +652,93 @@ class SystemHealthMonitor:
             Layout(name="right")
         )
         
+        # Header
+        header = Panel("System Health Monitor - collecting first sample...")
+        layout["header"].update(header)
+        
+        # Left Column: Metrics
+        cpu_panel = Panel(self._cpu_table())
+        layout["left"].update(cpu_panel)
+        
+        # Right Column: Services & Issues
+        svc_panel = Panel(self._services_table())
+        layout["right"].update(svc_panel)
+        
+        # Footer: Recommendations
+        footer = Panel("Recommendations: -", title="Alerts")
+        layout["footer"].update(footer)
+        
+        views = {
+            "header": header,
+            "cpu": cpu_panel,
+            "services": svc_panel,
+            "footer": footer,
+            "hostname": socket.gethostname(),
+        }
+        return layout, views
+
+    @staticmethod
+    def _cpu_table() -> Table:
+        table = Table(title="CPU & Memory")
+        table.add_column("Metric")
+        table.add_column("Value")
+        return table
+
+    @staticmethod
+    def _services_table() -> Table:
+        table = Table(title="Services")
+        table.add_column("Name")
+        table.add_column("Status")
+        return table
+
+    def _render_dashboard(self, views: Dict[str, Any], report: Dict[str, Any]):
+        """Refills the prebuilt dashboard panels with fresh tables from a health report."""
+        header = views["header"]
+        header.renderable = f"System Health Monitor - {views['hostname']} | Score: {report['health_score']}/100 | {report['timestamp']}"
+        header.style = f"bold {'green' if report['health_score'] > 80 else 'red'}"
+        
+        cpu_table = self._cpu_table()
+        c = report['metrics']['cpu']
+        m = report['metrics']['memory']
+        cpu_table.add_row("CPU Usage", f"{c['total_usage']}%")
+        cpu_table.add_row("Memory %", f"{m['percent']}%")
+        cpu_table.add_row("Disk Usage", f"{report['metrics']['disk'][0]['percent'] if report['metrics']['disk'] else 'N/A'}%")
+        views["cpu"].renderable = cpu_table
+        
+        svc_table = self._services_table()
+        for s in report['metrics']['services']:
+            svc_table.add_row(s['service'], f"[green]{s['status']}[/green]" if s['healthy'] else f"[red]{s['status']}[/red]")
+        views["services"].renderable = svc_table
+        
+        recs = "\n".join(report['recommendations']) if report['recommendations'] else "No issues detected."
+        views["footer"].renderable = f"Recommendations: {recs}"
+
+    def dashboard(self):
+        """
+        Displays a real-time Live dashboard. Reports are collected on a
+        background thread, so slow collectors never stall the render loop.
+        """
+        layout, views = self._build_dashboard()
+        
+        self._stop.clear()
+        sampler = threading.Thread(target=self._sampler_loop, name="health-sampler", daemon=True)
+        sampler.start()
+        
         with Live(layout, refresh_per_second=1, screen=True):
             try:
+                rendered = None
                 while True:
-                    report = self.generate_health_report()
-                    
-                    # Header
-                    header = Panel(
-                        f"System Health Monitor - {socket.gethostname()} | Score: {report['health_score']}/100 | {report['timestamp']}",
-                        style=f"bold {'green' if report['health_score'] > 80 else 'red'}"
-                    )
-                    layout["header"].update(header)
-                    
-                    # Left Column: Metrics
-                    cpu_table = Table(title="CPU & Memory")
-                    cpu_table.add_column("Metric")
-                    cpu_table.add_column("Value")
-                    
-                    c = report['metrics']['cpu']
-                    m = report['metrics']['memory']
-                    cpu_table.add_row("CPU Usage", f"{c['total_usage']}%")
-                    cpu_table.add_row("Memory %", f"{m['percent']}%")
-                    cpu_table.add_row("Disk Usage", f"{report['metrics']['disk'][0]['percent'] if report['metrics']['disk'] else 'N/A'}%")
-                    
-                    layout["left"].update(Panel(cpu_table))
-                    
-                    # Right Column: Services & Issues
-                    svc_table = Table(title="Services")
-                    svc_table.add_column("Name")
-                    svc_table.add_column("Status")
-                    
-                    for s in report['metrics']['services']:
-                        svc_table.add_row(s['service'], f"[green]{s['status']}[/green]" if s['healthy'] else f"[red]{s['status']}[/red]")
-                        
-                    layout["right"].update(Panel(svc_table))
-                    
-                    # Footer: Recommendations
-                    recs = "\n".join(report['recommendations']) if report['recommendations'] else "No issues detected."
-                    layout["footer"].update(Panel(f"Recommendations: {recs}", title="Alerts"))
-                    
-                    time.sleep(2)
+                    report = self._latest_report[0]
+                    # Only refill the panels when the sampler has published a new report
+                    if report is not None and report is not rendered:
+                        self._render_dashboard(views, report)
+                        rendered = report
+                    time.sleep(0.5)
             except KeyboardInterrupt:
                 pass
+            finally:
+                self._stop.set()
+                sampler.join(timeout=5)
 
 if __name__ == "__main__":
     monitor = SystemHealthMonitor()
@@ -1,4 +1,4 @@
-import json
+import orjson
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
@@ -21,8 +21,8 @@ class ReportGenerator:
         
         filepath = self.output_dir / filename
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=4, default=str)
+            # orjson handles datetimes natively; default=str covers anything else
+            filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str))
             logger.info(f"Report generated at {filepath}")
             return filepath
         except Exception as e:
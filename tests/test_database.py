@@ -0,0 +1,194 @@
+import gc
+import sqlite3
+import threading
+import weakref
+import pytest
+from net_diag_tool.core.database import DatabaseManager, local_time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+def test_indexes_created(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    conn = db._get_connection()
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+
+    assert "idx_checks_service_ts" in names
+    assert "idx_incidents_service" in names
+
+def test_uptime_stats(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    now = datetime.now()
+    db.log_check({"status": "up", "response_time_ms": 10.0, "timestamp": now}, "svc", "http")
+    db.log_check({"status": "down", "response_time_ms": 30.0, "timestamp": now}, "svc", "http")
+
+    stats = db.get_uptime_stats("svc", hours=24)
+    assert stats['total_checks'] == 2
+    assert stats['uptime_percent'] == 50.0
+    assert stats['avg_latency'] == 20.0
+
+def test_wal_mode_enabled(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    conn = db._get_connection()
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+
+    assert mode == "wal"
+
+def test_close_is_idempotent(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    db.close()
+    db.close()
+    assert db._conn is None
+    assert not db._finalizer.alive
+
+def test_unclosed_manager_is_collected(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    conn = db._conn
+    ref = weakref.ref(db)
+    del db
+    gc.collect()
+
+    assert ref() is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+def test_log_checks_bulk(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    rows = [
+        db.check_row({"status": "up", "response_time_ms": 5.0}, "svc-a", "http"),
+        db.check_row({"status": "down", "error": "Timeout"}, "svc-b", "tcp"),
+    ]
+    db.log_checks_bulk(rows)
+
+    assert db.get_history("svc-a")[0]['status'] == 'up'
+    assert db.get_history("svc-b")[0]['error_message'] == 'Timeout'
+
+def test_uptime_cache_invalidated_on_insert(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    now = datetime.now()
+    db.log_check({"status": "up", "response_time_ms": 10.0, "timestamp": now}, "svc", "http")
+    assert db.get_uptime_stats("svc")['total_checks'] == 1
+
+    db.log_check({"status": "up", "response_time_ms": 10.0, "timestamp": now}, "svc", "http")
+    assert db.get_uptime_stats("svc")['total_checks'] == 2
+
+def test_periodic_analyze(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    db.ANALYZE_EVERY = 2
+    analyzed = threading.Event()
+    with patch.object(db, "_analyze", side_effect=analyzed.set) as mock_analyze:
+        db.log_check({"status": "up"}, "svc", "http")
+        mock_analyze.assert_not_called()
+        db.log_check({"status": "up"}, "svc", "http")
+        # ANALYZE runs on the db-analyze thread
+        assert analyzed.wait(2)
+    
+    mock_analyze.assert_called_once_with()
+    assert db._inserts_since_analyze == 0
+
+def test_iter_history_streams_in_chunks(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    db.log_checks_bulk([db.check_row({"status": "up"}, "svc", "http") for _ in range(5)])
+
+    history = list(db.iter_history("svc", limit=4, chunk_size=2))
+    assert len(history) == 4
+    assert history[0]['service_name'] == "svc"
+
+def test_check_row_normalizes_timestamp():
+    row = DatabaseManager.check_row({"status": "up", "timestamp": datetime(2025, 1, 28, 14, 30, 45, tzinfo=timezone.utc)}, "svc", "http")
+    assert row[-1] == "2025-01-28 14:30:45.000000"
+
+    row = DatabaseManager.check_row({"status": "up", "timestamp": "2025-01-28T16:30:45+02:00"}, "svc", "http")
+    assert row[-1] == "2025-01-28 14:30:45.000000"
+
+    row = DatabaseManager.check_row({"status": "up"}, "svc", "http")
+    assert row[-1] is not None
+
+def test_legacy_local_timestamps_migrated(tmp_path):
+    path = str(tmp_path / "test.db")
+    DatabaseManager(path).close()
+    # Rows as written by schema version 0: naive local datetimes, space or 'T' separated
+    older, old = datetime(2025, 1, 28, 9, 0, 0, 250000), datetime(2025, 1, 28, 9, 30, 0)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO service_checks (service_name, service_type, status, timestamp) VALUES ('svc', 'http', 'up', ?)",
+        [(str(older),), (old.isoformat(),)]
+    )
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    db = DatabaseManager(path)
+    db.log_check({"status": "down", "timestamp": datetime(2025, 1, 29, 12, 0, tzinfo=timezone.utc)}, "svc", "http")
+    history = db.get_history("svc")
+
+    assert [row['status'] for row in history] == ["down", "up", "up"]
+    assert [local_time(row['timestamp']) for row in history[1:]] == [old, older]
+    assert history[2]['timestamp'] == older.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    assert sum(total for _, _, total in db._conn.execute("SELECT hour_bucket, up, total FROM uptime_agg")) == 3
+    db.close()
+
+    # Runs once: a reopen leaves the rewritten rows alone
+    db = DatabaseManager(path)
+    assert [row['timestamp'] for row in db.get_history("svc")] == [row['timestamp'] for row in history]
+
+def test_log_checks_bulk_retries_when_locked(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    real_conn = db._conn
+    calls = []
+
+    class FlakyConnection:
+        def __enter__(self):
+            return real_conn.__enter__()
+
+        def __exit__(self, *exc):
+            return real_conn.__exit__(*exc)
+
+        def executemany(self, sql, rows):
+            if "service_checks" in sql:
+                calls.append(sql)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return real_conn.executemany(sql, rows)
+
+    db._conn = FlakyConnection()
+    with patch("time.sleep"):
+        db.log_check({"status": "up"}, "svc", "http")
+    db._conn = real_conn
+
+    assert len(calls) == 2
+    assert len(db.get_history("svc")) == 1
+
+def test_uptime_agg_backfilled_from_history(tmp_path):
+    path = str(tmp_path / "test.db")
+    db = DatabaseManager(path)
+    db.log_check({"status": "up", "response_time_ms": 10.0}, "svc", "http")
+    db._conn.execute("DROP TABLE uptime_agg")
+    db._conn.commit()
+    db.close()
+
+    db = DatabaseManager(path)
+    stats = db.get_uptime_stats("svc")
+    assert stats['total_checks'] == 1
+    assert stats['avg_latency'] == 10.0
+
+def test_get_uptime_buckets(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    db.log_check({"status": "up"}, "svc", "http")
+    db.log_check({"status": "down"}, "svc", "http")
+
+    buckets = db.get_uptime_buckets("svc")
+    assert len(buckets) == 1
+    assert tuple(buckets[0][1:]) == (1, 2)
+
+def test_log_checks_bulk_rollup_only(tmp_path):
+    db = DatabaseManager(str(tmp_path / "test.db"))
+    logged = db.check_row({"status": "up", "response_time_ms": 10.0}, "svc", "http")
+    skipped = db.check_row({"status": "up", "response_time_ms": 30.0}, "svc", "http")
+    db.log_checks_bulk([logged], rollup_only=[skipped])
+
+    assert len(db.get_history("svc")) == 1
+    stats = db.get_uptime_stats("svc")
+    assert stats['total_checks'] == 2
+    assert stats['avg_latency'] == 20.0
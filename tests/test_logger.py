@@ -0,0 +1,8 @@
+from net_diag_tool.core.logger import setup_logger
+
+def test_setup_logger_is_idempotent():
+    first = setup_logger("netdiag.test")
+    second = setup_logger("netdiag.test")
+
+    assert first is second
+    assert len(second.handlers) == 1
@@ -1,28 +1,46 @@
-from net_diag_tool.modules.network.diagnostics import NetworkDiagnostics
+from net_diag_tool.modules.network.diagnostics import (
+    NetworkDiagnostics, ping_many, _DNS_CACHE, _icmp_checksum, _icmp_echo_request,
+    _icmp_parse_reply, _ifaddrs_ipv4, _open_icmp_socket,
+)
 from unittest.mock import patch, MagicMock
+import asyncio
+import http.server
+import io
+import json
+from datetime import datetime
+import socket
+import struct
+import threading
+import dns.resolver
+import pytest
 
+@patch('net_diag_tool.modules.network.diagnostics._open_icmp_socket', return_value=None)
 @patch('subprocess.run')
-def test_ping_host(mock_run):
+def test_ping_host(mock_run, mock_icmp):
     tool = NetworkDiagnostics()
     
     # Mock successful ping output (Linux style)
     mock_run.return_value.returncode = 0
-    mock_run.return_value.stdout = "4 packets transmitted, 4 received, 0% packet loss, time 3000ms\nrtt min/avg/max/mdev = 10.0/12.5/15.0/2.2 ms"
+    mock_run.return_value.stdout = b"4 packets transmitted, 4 received, 0% packet loss, time 3000ms\nrtt min/avg/max/mdev = 10.0/12.5/15.0/2.2 ms"
     
     result = tool.ping_host("localhost")
     assert result['success'] is True
     assert result['packet_loss_percent'] == 0.0
+    if tool.os_type != 'windows':
+        assert '-n' in mock_run.call_args[0][0]
     
     # Mock failed ping
     mock_run.return_value.returncode = 1
-    mock_run.return_value.stdout = "100% packet loss"
+    mock_run.return_value.stdout = b"100% packet loss"
     
     result = tool.ping_host("invalid-host")
     assert result['success'] is False
+    assert result['output'] == "100% packet loss"
 
-@patch('requests.get')
-def test_check_http_status(mock_get):
+def test_check_http_status():
     tool = NetworkDiagnostics()
+    mock_head = MagicMock()
+    tool.http.head = mock_head
     
     # Mock success
     start_time = 0
@@ -32,13 +50,275 @@ def test_check_http_status(mock_get):
     mock_response.reason = "OK"
     mock_response.history = []
     mock_response.headers = {}
-    mock_get.return_value = mock_response
+    mock_head.return_value = mock_response
     
     result = tool.check_http_status("http://example.com")
     assert result['is_active'] is True
     assert result['status_code'] == 200
 
     # Mock connection error
-    mock_get.side_effect = Exception("Connection Refused")
+    mock_head.side_effect = Exception("Connection Refused")
     result = tool.check_http_status("http://bad-url.com")
     assert result['is_active'] is False
+
+def test_icmp_packet_roundtrip():
+    packet = _icmp_echo_request(0x1234, 7)
+    assert _icmp_checksum(packet) == 0
+
+    # Echo reply as delivered on a DGRAM socket (no IP header)
+    reply = struct.pack("!BBHHH", 0, 0, 0, 0x1234, 7) + packet[8:]
+    assert _icmp_parse_reply(reply) == (0x1234, 7)
+
+    # Our own echo request is not a reply
+    assert _icmp_parse_reply(packet) is None
+
+def _dns_answer(text, ttl=60):
+    answer = MagicMock()
+    answer.__iter__.return_value = [MagicMock(to_text=MagicMock(return_value=text))]
+    answer.rrset.ttl = ttl
+    return answer
+
+def test_dns_lookup_parallel_records():
+    _DNS_CACHE.clear()
+    tool = NetworkDiagnostics()
+    resolver = MagicMock(nameservers=["192.0.2.53"])
+
+    def resolve(hostname, r_type):
+        if r_type == "AAAA":
+            raise dns.resolver.NoAnswer()
+        return _dns_answer(f"{r_type}-record")
+
+    resolver.resolve.side_effect = resolve
+    with patch('net_diag_tool.modules.network.diagnostics._get_resolver', return_value=resolver):
+        result = tool.dns_lookup("example.com")
+
+    assert list(result['records']) == ['A', 'AAAA', 'MX', 'NS']
+    assert result['records']['A'] == ["A-record"]
+    assert result['records']['AAAA'] == []
+    assert result['nameserver_used'] == "192.0.2.53"
+
+    resolver.resolve.side_effect = dns.resolver.NXDOMAIN()
+    with patch('net_diag_tool.modules.network.diagnostics._get_resolver', return_value=resolver):
+        result = tool.dns_lookup("missing.invalid")
+    assert result['error'] == "Domain does not exist"
+
+def test_dns_lookup_cached():
+    _DNS_CACHE.clear()
+    tool = NetworkDiagnostics()
+    resolver = MagicMock(nameservers=["192.0.2.53"])
+    resolver.resolve.side_effect = lambda hostname, r_type: _dns_answer(f"{r_type}-record")
+
+    with patch('net_diag_tool.modules.network.diagnostics._get_resolver', return_value=resolver):
+        first = tool.dns_lookup("example.com")
+        second = tool.dns_lookup("EXAMPLE.com")
+
+    assert first['records'] == second['records']
+    assert resolver.resolve.call_count == 4
+
+    # Negative answers are cached too
+    resolver.resolve.side_effect = dns.resolver.NXDOMAIN()
+    with patch('net_diag_tool.modules.network.diagnostics._get_resolver', return_value=resolver):
+        tool.dns_lookup("missing.invalid")
+        result = tool.dns_lookup("missing.invalid")
+    assert result['error'] == "Domain does not exist"
+    assert resolver.resolve.call_count <= 12
+
+def test_check_ports_batch():
+    tool = NetworkDiagnostics()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    open_port = listener.getsockname()[1]
+
+    closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+
+    try:
+        results = tool.check_ports_batch("127.0.0.1", [open_port, closed_port], timeout=2)
+    finally:
+        listener.close()
+
+    assert list(results) == [open_port, closed_port]
+    assert results[open_port]['status'] == "OPEN"
+    assert results[closed_port]['status'] == "CLOSED"
+    assert tool.check_port("127.0.0.1", closed_port)['status'] == "CLOSED"
+
+class _PayloadHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(302)
+            self.send_header("Location", "/file")
+            self.end_headers()
+            return
+        body = b"x" * (3 * 65536 + 100)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_bandwidth_test_counts_bytes():
+    tool = NetworkDiagnostics()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _PayloadHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        result = tool.bandwidth_test(f"http://127.0.0.1:{server.server_address[1]}/old")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result['downloaded_bytes'] == 3 * 65536 + 100
+
+@patch('subprocess.Popen')
+def test_traceroute_parses_hops(mock_popen):
+    tool = NetworkDiagnostics()
+    proc = mock_popen.return_value
+    proc.stdout = io.BytesIO(
+        b"traceroute to example.com (93.184.216.34), 30 hops max, 60 byte packets\n"
+        b" 1  192.168.1.1  0.123 ms  0.111 ms  0.105 ms\n"
+        b" 2  * * *\n"
+        b"  3    <1 ms    12 ms    <1 ms  10.0.0.1\n"
+    )
+    proc.wait.return_value = 0
+
+    result = tool.traceroute("example.com")
+    assert result['success'] is True
+    assert result['hop_count'] == 3
+    assert result['hops'][0] == {"hop": "1", "ip": "192.168.1.1", "latencies": ["0.123", "0.111", "0.105"]}
+    assert result['hops'][1]['ip'] == "*"
+    assert result['hops'][2] == {"hop": "3", "ip": "10.0.0.1", "latencies": ["1", "12", "1"]}
+
+@patch('net_diag_tool.modules.network.diagnostics.ping_many', return_value=None)
+def test_continuous_monitor_pings_concurrently(mock_many):
+    tool = NetworkDiagnostics()
+    with patch.object(tool, "ping_host", return_value={"success": True, "avg_latency_ms": 1.0}) as mock_ping:
+        log = tool.continuous_monitor(["a", "b", "c"], interval=0, cycles=2)
+
+    assert len(log) == 2
+    assert sorted(check['host'] for check in log[0]['checks']) == ["a", "b", "c"]
+    assert mock_ping.call_count == 6
+
+@patch('net_diag_tool.modules.network.diagnostics.ping_many')
+def test_continuous_monitor_uses_ping_many(mock_many):
+    tool = NetworkDiagnostics()
+    mock_many.return_value = {
+        "a": {"host": "a", "success": True, "avg_latency_ms": 1.0},
+        "b": {"host": "b", "success": False, "avg_latency_ms": None},
+    }
+    with patch.object(tool, "ping_host") as mock_ping:
+        log = tool.continuous_monitor(["a", "b"], interval=0, cycles=1)
+
+    mock_ping.assert_not_called()
+    assert [check['status'] for check in log[0]['checks']] == ["UP", "DOWN"]
+
+def test_ping_many_loopback():
+    sock = _open_icmp_socket()
+    if sock is None:
+        pytest.skip("ICMP sockets not permitted")
+    sock.close()
+
+    results = ping_many(["127.0.0.1", "localhost"], count=2, timeout=2)
+    assert set(results) == {"127.0.0.1", "localhost"}
+    assert all(res['success'] for res in results.values())
+    assert results["127.0.0.1"]['packet_loss_percent'] == 0.0
+
+@patch('socket.gethostbyname', side_effect=socket.gaierror("Name or service not known"))
+@patch('net_diag_tool.modules.network.diagnostics._open_icmp_socket')
+def test_ping_host_unresolvable(mock_icmp, mock_resolve):
+    mock_icmp.return_value = MagicMock(type=socket.SOCK_DGRAM)
+    tool = NetworkDiagnostics()
+
+    result = tool.ping_host("nonexistent.invalid", count=2)
+    assert result['success'] is False
+    assert result['packet_loss_percent'] == 100.0
+    assert result['avg_latency_ms'] is None
+    assert "Name or service not known" in result['error']
+    mock_icmp.return_value.sendto.assert_not_called()
+
+def test_export_report_html(tmp_path):
+    tool = NetworkDiagnostics()
+    tool.reports_dir = tmp_path
+
+    path = tool.export_report({"ping": {"host": "<gw>", "success": True}}, format="html")
+    content = open(path, encoding="utf-8").read()
+
+    assert "<h2>Ping</h2>" in content
+    assert "&lt;gw&gt;" in content
+    assert content.rstrip().endswith("</html>")
+
+def test_export_report_json(tmp_path):
+    tool = NetworkDiagnostics()
+    tool.reports_dir = tmp_path
+    stamp = datetime(2025, 1, 28, 14, 30)
+
+    path = tool.export_report({"ports": {"scan_results": {80: {"status": "OPEN"}}}, "when": stamp}, format="json")
+    data = json.loads(open(path, encoding="utf-8").read())
+
+    assert data["ports"]["scan_results"]["80"]["status"] == "OPEN"
+    assert data["when"].startswith("2025-01-28")
+
+def test_run_all_async_collects_errors():
+    tool = NetworkDiagnostics()
+
+    def boom():
+        raise RuntimeError("no route")
+
+    results = asyncio.run(tool.run_all_async({"ok": lambda: {"success": True}, "bad": boom}))
+    assert results["ok"] == {"success": True}
+    assert results["bad"] == {"error": "no route"}
+
+@patch('net_diag_tool.modules.network.diagnostics._ifaddrs_ipv4', return_value=None)
+@patch('net_diag_tool.modules.network.diagnostics._count_proc_sockets', return_value=7)
+@patch('psutil.net_if_addrs')
+def test_get_local_network_info(mock_addrs, mock_count, mock_ifaddrs):
+    tool = NetworkDiagnostics()
+    mock_addrs.return_value = {
+        "eth0": [MagicMock(family=socket.AF_INET, address="10.0.0.2", netmask="255.0.0.0", broadcast=None)],
+        "veth0": [MagicMock(family=socket.AF_INET6, address="fe80::1", netmask=None, broadcast=None)],
+    }
+
+    info = tool.get_local_network_info()
+    assert list(info["interfaces"]) == ["eth0"]
+    assert info["interfaces"]["eth0"][0]["ip"] == "10.0.0.2"
+    assert info["active_connections_count"] == 7
+
+@patch('netifaces.gateways')
+def test_default_gateway_cached(mock_gateways):
+    import netifaces
+    NetworkDiagnostics.get_default_gateway.cache_clear()
+    mock_gateways.return_value = {"default": {netifaces.AF_INET: ("10.0.0.1", "eth0")}}
+
+    assert NetworkDiagnostics.get_default_gateway() == "10.0.0.1"
+    assert NetworkDiagnostics.get_default_gateway() == "10.0.0.1"
+    assert mock_gateways.call_count == 1
+
+    NetworkDiagnostics.get_default_gateway.cache_clear()
+
+def test_check_http_status_falls_back_to_get():
+    tool = NetworkDiagnostics()
+    tool.http.head = MagicMock(return_value=MagicMock(status_code=405))
+    get_response = MagicMock(status_code=200, ok=True, reason="OK", history=[], headers={})
+    tool.http.get = MagicMock(return_value=get_response)
+
+    result = tool.check_http_status("http://example.com")
+    assert result['status_code'] == 200
+    assert tool.http.get.call_args.kwargs['stream'] is True
+    get_response.close.assert_called_once()
+
+def test_ifaddrs_matches_psutil():
+    interfaces = _ifaddrs_ipv4()
+    if interfaces is None:
+        pytest.skip("getifaddrs not available")
+
+    import psutil
+    expected = {
+        name: [snic.address for snic in snics if snic.family == socket.AF_INET]
+        for name, snics in psutil.net_if_addrs().items()
+    }
+    assert {name: [e["ip"] for e in entries] for name, entries in interfaces.items()} == \
+        {name: ips for name, ips in expected.items() if ips}
@@ -1,34 +1,204 @@
-from net_diag_tool.modules.services.checker import ServiceHealthChecker
-from unittest.mock import patch, MagicMock
+import asyncio
+import threading
+import httpx
+from net_diag_tool.modules.services.checker import ServiceHealthChecker, ServiceSpec, _UptimeWindow
+from unittest.mock import patch, MagicMock, AsyncMock
 
-@patch('requests.get')
-def test_check_http_service(mock_get):
+def test_check_http_service():
     checker = ServiceHealthChecker()
-    mock_resp = MagicMock()
-    mock_resp.status_code = 200
-    mock_get.return_value = mock_resp
-    
-    res = checker.check_http_service("https://google.com")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await checker.check_http_service(client, "https://google.com")
+
+    res = asyncio.run(run())
     assert res['status'] == 'up'
     assert res['status_code'] == 200
+    assert res['ssl_valid'] is True
 
-@patch('socket.create_connection')
-def test_check_tcp_service(mock_socket):
+@patch('asyncio.open_connection', new_callable=AsyncMock)
+def test_check_tcp_service(mock_open):
     checker = ServiceHealthChecker()
+    writer = MagicMock()
+    writer.wait_closed = AsyncMock()
+    mock_open.return_value = (MagicMock(), writer)
     # No exception means success
-    res = checker.check_tcp_service("localhost", 22)
+    res = asyncio.run(checker.check_tcp_service("localhost", 22))
     assert res['status'] == 'up'
 
-@patch('dns.resolver.Resolver.resolve')
-def test_check_dns(mock_resolve):
+@patch('net_diag_tool.modules.services.checker._get_async_resolver')
+def test_check_dns(mock_get_resolver):
     checker = ServiceHealthChecker()
     mock_answer = MagicMock()
     mock_answer.to_text.return_value = "1.2.3.4"
-    mock_resolve.return_value = [mock_answer]
+    answers = MagicMock()
+    answers.__iter__.return_value = iter([mock_answer])
+    answers.rrset.ttl = 300
+    mock_get_resolver.return_value.resolve = AsyncMock(return_value=answers)
     
-    res = checker.check_dns_resolution("example.com", expected_ip="1.2.3.4")
+    res = asyncio.run(checker.check_dns_resolution("example.com", expected_ip="1.2.3.4"))
     assert res['status'] == 'up'
     
-    res_fail = checker.check_dns_resolution("example.com", expected_ip="9.9.9.9")
+    res_fail = asyncio.run(checker.check_dns_resolution("example.com", expected_ip="9.9.9.9"))
     assert res_fail['status'] == 'down'
     assert "IP mismatch" in res_fail['error']
+
+def test_check_api_endpoint():
+    checker = ServiceHealthChecker()
+    bodies = {"/ok": b'{"healthy": true}', "/bad": b"<html>"}
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=bodies[request.url.path]))
+
+    async def run(path):
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await checker.check_api_endpoint(client, "http://api.test" + path)
+
+    res = asyncio.run(run("/ok"))
+    assert res['status'] == 'up'
+    assert res['data_sample'] == "{'healthy': True}"
+
+    res = asyncio.run(run("/bad"))
+    assert res['status'] == 'down'
+    assert res['error'] == "Invalid JSON response"
+
+def test_uptime_window_expires_old_samples():
+    window = _UptimeWindow(span=100)
+    window.add(0, 10, 10) # hourly rollup from the DB
+    window.add(50, True)
+    window.add(60, False)
+
+    assert window.uptime_percent(now=90) == 11 / 12 * 100
+    assert window.uptime_percent(now=145) == 50.0
+    assert window.uptime_percent(now=1000) == 0.0
+
+
+def test_io_pool_follows_client_lifecycle():
+    checker = ServiceHealthChecker()
+
+    async def run():
+        async with checker:
+            pool = checker._io_pool
+            thread = await asyncio.get_running_loop().run_in_executor(pool, threading.current_thread)
+        return pool, thread.name
+
+    pool, thread_name = asyncio.run(run())
+    assert thread_name.startswith("netdiag-io")
+    # One writer, so DB batches land in flush order
+    assert pool._max_workers == 1
+    assert checker._io_pool is None
+    assert pool._shutdown
+
+def test_service_spec_applies_defaults():
+    http = ServiceSpec.from_config({"name": "web", "url": "https://example.com"})
+    assert (http.type, http.timeout, http.expected_status, http.method) == ("http", 10, 200, "GET")
+
+    tcp = ServiceSpec.from_config({"name": "ssh", "type": "tcp", "host": "localhost", "port": 22})
+    assert tcp.timeout == 5
+    assert tcp.port == 22
+    assert tcp.check_interval is None
+
+def test_monitoring_loop_staggers_checks(tmp_path):
+    config = tmp_path / "services.json"
+    config.write_text('{"services": [{"name": "a", "type": "tcp", "host": "h", "port": 1},'
+                      ' {"name": "b", "type": "tcp", "host": "h", "port": 2}]}')
+    checker = ServiceHealthChecker(config_file=str(config))
+    started = {}
+
+    async def fake_check(client, service, timestamp=None):
+        started.setdefault(service.name, asyncio.get_running_loop().time())
+        return {"timestamp": timestamp, "status": "up", "response_time_ms": 1.0}
+
+    async def run():
+        task = asyncio.create_task(checker.run_monitoring_loop(interval=0.4, flush_interval=0.05))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        await task
+
+    with patch.object(checker, "perform_check", side_effect=fake_check), \
+         patch.object(checker.db, "log_checks_bulk") as mock_log:
+        asyncio.run(run())
+
+    # Second service starts half an interval after the first
+    assert 0.15 < started["b"] - started["a"] < 0.3
+    assert len(checker.metrics["a"]) == 2
+    assert len(checker.metrics["b"]) == 1
+    assert mock_log.call_count >= 2
+
+def test_monitoring_loop_honours_check_interval(tmp_path):
+    config = tmp_path / "services.json"
+    config.write_text('{"services": [{"name": "a", "type": "tcp", "host": "h", "port": 1, "check_interval": 0.1},'
+                      ' {"name": "b", "type": "tcp", "host": "h", "port": 2}]}')
+    checker = ServiceHealthChecker(config_file=str(config))
+
+    async def fake_check(client, service, timestamp=None):
+        return {"timestamp": timestamp, "status": "up", "response_time_ms": 1.0}
+
+    async def run():
+        task = asyncio.create_task(checker.run_monitoring_loop(interval=10, flush_interval=0.01))
+        await asyncio.sleep(0.45)
+        task.cancel()
+        await task
+
+    with patch.object(checker, "perform_check", side_effect=fake_check), \
+         patch.object(checker.db, "log_checks_bulk"):
+        asyncio.run(run())
+
+    # "a" runs on its own 0.1 s schedule; "b" falls back to the loop interval and starts 5 s in
+    assert len(checker.metrics["a"]) == 5
+    assert len(checker.metrics["b"]) == 0
+
+def test_monitoring_loop_alerts_when_service_goes_down(tmp_path):
+    config = tmp_path / "services.json"
+    config.write_text('{"services": [{"name": "a", "type": "tcp", "host": "h", "port": 1, "alert_on_failure": true},'
+                      ' {"name": "b", "type": "tcp", "host": "h", "port": 2}]}')
+    checker = ServiceHealthChecker(config_file=str(config))
+    statuses = iter(["up", "down", "down", "up", "down"])
+
+    async def fake_check(client, service, timestamp=None):
+        status = next(statuses, "down") if service.name == "a" else "down"
+        return {"timestamp": timestamp, "status": status, "response_time_ms": 1.0, "error": "refused"}
+
+    async def run():
+        task = asyncio.create_task(checker.run_monitoring_loop(interval=0.1, flush_interval=0.01))
+        await asyncio.sleep(0.55)
+        task.cancel()
+        await task
+
+    with patch.object(checker, "perform_check", side_effect=fake_check), \
+         patch.object(checker.db, "log_checks_bulk"):
+        asyncio.run(run())
+
+    # Only "a" opts in, and it alerts on each up -> down transition
+    assert len(checker.metrics["a"]) >= 5
+    assert [a["message"] for a in checker.alerts] == ["ALERT: a is DOWN. Detail: refused"] * 2
+
+def test_monitor_continuously_prefers_uvloop():
+    checker = ServiceHealthChecker()
+    fake_uvloop = MagicMock()
+    with patch.dict("sys.modules", {"uvloop": fake_uvloop}), \
+         patch.object(checker, "run_monitoring_loop", MagicMock(return_value="coro")):
+        checker.monitor_continuously(interval=5)
+
+    fake_uvloop.run.assert_called_once_with("coro")
+
+@patch('net_diag_tool.modules.services.checker._get_async_resolver')
+def test_check_dns_coalesces_concurrent_lookups(mock_get_resolver):
+    checker = ServiceHealthChecker()
+    mock_answer = MagicMock()
+    mock_answer.to_text.return_value = "1.2.3.4"
+    answers = MagicMock()
+    answers.__iter__.side_effect = lambda: iter([mock_answer])
+    answers.rrset.ttl = 300
+
+    async def slow_resolve(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return answers
+    mock_get_resolver.return_value.resolve = AsyncMock(side_effect=slow_resolve)
+
+    async def run():
+        return await asyncio.gather(*(checker.check_dns_resolution("example.com") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert all(r['ips'] == ["1.2.3.4"] for r in results)
+    assert mock_get_resolver.return_value.resolve.await_count == 1
+    assert checker._dns_inflight == {}
@@ -1,5 +1,12 @@
-from net_diag_tool.modules.system.health import SystemHealthMonitor
+import json
+import orjson
+import os
+import socket
+import threading
+from datetime import datetime
+from net_diag_tool.modules.system.health import SystemHealthMonitor, _RingBuffer, _internet_reachable, _tail_lines
 from unittest.mock import patch, MagicMock
+from rich.console import Console
 
 def test_system_health_monitor_init():
     monitor = SystemHealthMonitor()
@@ -9,6 +16,7 @@ def test_system_health_monitor_init():
 @patch('psutil.cpu_percent')
 def test_get_cpu_metrics(mock_cpu):
     monitor = SystemHealthMonitor()
+    monitor.sample_interval = 0
     mock_cpu.return_value = 50.0
     
     metrics = monitor.get_cpu_metrics()
@@ -29,3 +37,228 @@ def test_get_memory_metrics(mock_mem):
     assert metrics['total_gb'] == 16.0
     assert metrics['percent'] == 50.0
     assert metrics['status'] == 'healthy'
+
+def test_collectors_share_process_snapshot():
+    monitor = SystemHealthMonitor()
+    monitor.sample_interval = 0
+    monitor.config["critical_services"] = ["nginx"]
+    procs = [
+        {'pid': 1, 'name': 'nginx', 'cpu_percent': 5.0, 'exe': None, 'memory_percent': 60.0, 'memory_info': MagicMock(rss=1024)},
+        {'pid': 2, 'name': 'idle', 'cpu_percent': None, 'exe': None, 'memory_percent': None, 'memory_info': None},
+    ]
+
+    with patch('psutil.process_iter') as mock_iter:
+        cpu = monitor.get_cpu_metrics(procs)
+        mem = monitor.get_memory_metrics(procs)
+        services = monitor.check_critical_services(procs)
+    mock_iter.assert_not_called()
+
+    assert cpu['top_processes'][0]['name'] == 'nginx'
+    assert mem['top_processes'][0]['rss'] == 1024
+    assert mem['leaks_detected'][0]['pid'] == 1
+    assert services[0]['healthy'] is True
+
+@patch('time.sleep')
+@patch('psutil.cpu_percent', return_value=10.0)
+def test_cpu_metrics_do_not_block_between_ticks(mock_cpu, mock_sleep):
+    monitor = SystemHealthMonitor()
+    monitor.get_cpu_metrics([])
+    mock_sleep.assert_called_once()
+
+    # A later tick well past the minimum window samples without sleeping
+    monitor._cpu_sampled_at -= 10
+    monitor.get_cpu_metrics([])
+    mock_sleep.assert_called_once()
+    assert all(call.kwargs.get('interval') is None for call in mock_cpu.call_args_list)
+
+def test_sampler_publishes_latest_report():
+    monitor = SystemHealthMonitor()
+    report = {"health_score": 100}
+
+    def fake_report():
+        monitor._stop.set()
+        return report
+
+    with patch.object(monitor, 'generate_health_report', side_effect=fake_report):
+        monitor._sampler_loop(interval=0)
+
+    assert monitor._latest_report[0] is report
+
+def test_internet_reachable_probe():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    assert _internet_reachable(("127.0.0.1", port)) is True
+    server.close()
+
+    # Refused connections also become writable; the pending error must be checked
+    assert _internet_reachable(("127.0.0.1", port)) is False
+
+def test_config_parsed_once_per_file_version(tmp_path):
+    config_file = tmp_path / "monitoring.json"
+    config_file.write_text('{"thresholds": {"cpu_percent_critical": 95}}')
+
+    with patch('orjson.loads', wraps=orjson.loads) as mock_load:
+        first = SystemHealthMonitor(str(config_file))
+        first.config["thresholds"]["cpu_percent_critical"] = 1
+        second = SystemHealthMonitor(str(config_file))
+    assert mock_load.call_count == 1
+    assert second.config["thresholds"]["cpu_percent_critical"] == 95
+
+    config_file.write_text('{"thresholds": {"cpu_percent_critical": 70}}')
+    os.utime(config_file, ns=(0, config_file.stat().st_mtime_ns + 1_000_000))
+    assert SystemHealthMonitor(str(config_file)).config["thresholds"]["cpu_percent_critical"] == 70
+
+def test_ring_buffer_keeps_latest_in_order():
+    buf = _RingBuffer(3)
+    for value in range(5):
+        buf.append(value)
+    assert len(buf) == 3
+    assert buf.view().tolist() == [2.0, 3.0, 4.0]
+
+def test_detect_anomalies():
+    monitor = SystemHealthMonitor()
+    for value in [10] * 10 + [90] * 5:
+        monitor.history["cpu_percent"].append(value)
+
+    anomalies = monitor.detect_anomalies()
+    assert "CPU usage significantly higher than average" in anomalies
+
+def test_tail_lines_matches_tail(tmp_path):
+    log = tmp_path / "syslog"
+    lines = [f"line {i} ".encode() * (i % 7 + 1) for i in range(500)]
+    log.write_bytes(b"\n".join(lines) + b"\n")
+
+    assert _tail_lines(log, 200, block_size=64) == lines[-200:]
+    assert _tail_lines(log, 1000) == lines
+
+def test_syslog_scan_matches_keywords(tmp_path):
+    log = tmp_path / "syslog"
+    log.write_bytes(b"ok line\nkernel: I/O ERROR on sda\nsshd: Failed password\nall good\n")
+    monitor = SystemHealthMonitor()
+    monitor.os_type = 'linux'
+
+    with patch('net_diag_tool.modules.system.health.Path', return_value=log):
+        result = monitor.check_system_logs_for_errors()
+
+    assert result['error_count'] == 2
+    assert result['recent_errors'] == ["kernel: I/O ERROR on sda", "sshd: Failed password"]
+
+def test_get_status_uses_configured_thresholds(tmp_path):
+    config_file = tmp_path / "monitoring.json"
+    config_file.write_text('{"thresholds": {"disk_percent_critical": 95, "disk_percent_warning": 70}}')
+    monitor = SystemHealthMonitor(str(config_file))
+
+    assert monitor._get_status(96, "disk_percent") == "critical"
+    assert monitor._get_status(75, "disk_percent") == "warning"
+    assert monitor._get_status(85, "cpu_percent") == "warning"
+    assert monitor._get_status(50, "cpu_percent") == "healthy"
+
+@patch('subprocess.run')
+def test_windows_services_listed_once(mock_run):
+    mock_run.return_value = MagicMock(stdout=(
+        "SERVICE_NAME: Spooler\nDISPLAY_NAME: Print Spooler\n        STATE              : 4  RUNNING\n\n"
+        "SERVICE_NAME: W32Time\nDISPLAY_NAME: Windows Time\n        STATE              : 1  STOPPED\n"
+    ))
+    monitor = SystemHealthMonitor()
+
+    assert monitor._check_windows_service("spooler") is True
+    assert monitor._check_windows_service("W32Time") is False
+    assert monitor._check_windows_service("missing") is False
+    mock_run.assert_called_once()
+
+@patch('subprocess.run')
+def test_systemd_units_checked_in_one_call(mock_run):
+    mock_run.return_value = MagicMock(stdout="active\ninactive\n")
+    monitor = SystemHealthMonitor()
+    monitor.os_type = 'linux'
+    monitor.config["critical_services"] = ["nginx", "docker", "cron"]
+    procs = [{'name': 'cron'}]
+
+    services = monitor.check_critical_services(procs)
+
+    mock_run.assert_called_once()
+    assert mock_run.call_args.args[0] == ["systemctl", "is-active", "nginx", "docker"]
+    assert [s['healthy'] for s in services] == [True, False, True]
+
+@patch('smtplib.SMTP')
+def test_alert_email_body_is_json(mock_smtp):
+    monitor = SystemHealthMonitor()
+    monitor.config["alerting"] = {
+        "enabled": True, "email_enabled": True, "sender_email": "a@x", "receiver_email": "b@x",
+        "smtp_server": "smtp", "smtp_port": 587, "smtp_user": "u", "smtp_password": "p",
+    }
+    report = {"health_score": 70, "timestamp": datetime(2025, 1, 28, 14, 30)}
+
+    monitor.send_alert_email(report)
+
+    msg = mock_smtp.return_value.__enter__.return_value.send_message.call_args.args[0]
+    assert json.loads(msg.get_payload()) == {"health_score": 70, "timestamp": "2025-01-28T14:30:00"}
+
+def test_disk_metrics_skip_stalled_mounts():
+    monitor = SystemHealthMonitor()
+    parts = [MagicMock(device="/dev/sda1", mountpoint="/", fstype="ext4"),
+             MagicMock(device="nfs:/export", mountpoint="/mnt/nfs", fstype="nfs")]
+    release = threading.Event()
+
+    def fake_usage(mountpoint):
+        if mountpoint == "/mnt/nfs":
+            release.wait(5)
+        return MagicMock(total=100 * 1024**3, used=40 * 1024**3, free=60 * 1024**3, percent=40.0)
+
+    with patch('psutil.disk_partitions', return_value=parts), \
+         patch('psutil.disk_usage', side_effect=fake_usage):
+        disks = monitor.get_disk_metrics(timeout=0.2)
+    release.set()
+
+    assert [d['mountpoint'] for d in disks] == ["/"]
+    assert disks[0]['used_gb'] == 40.0
+
+def test_disk_metrics_reuse_pending_probe():
+    monitor = SystemHealthMonitor()
+    parts = [MagicMock(device="nfs:/export", mountpoint="/mnt/nfs", fstype="nfs")]
+    release = threading.Event()
+    calls = []
+
+    def fake_usage(mountpoint):
+        calls.append(mountpoint)
+        release.wait(5)
+        return MagicMock(total=100 * 1024**3, used=40 * 1024**3, free=60 * 1024**3, percent=40.0)
+
+    with patch('psutil.disk_partitions', return_value=parts), \
+         patch('psutil.disk_usage', side_effect=fake_usage):
+        monitor.get_disk_metrics(timeout=0.05)
+        threads = threading.active_count()
+        for _ in range(5):
+            assert monitor.get_disk_metrics(timeout=0.05) == []
+        assert threading.active_count() == threads
+        assert calls == ["/mnt/nfs"]
+
+        # Once the mount answers, the finished probe is picked up and the next call starts afresh
+        release.set()
+        monitor._disk_probes["/mnt/nfs"].result(timeout=1)
+        assert [d['mountpoint'] for d in monitor.get_disk_metrics(timeout=1)] == ["/mnt/nfs"]
+
+def test_dashboard_panels_refilled_per_report():
+    monitor = SystemHealthMonitor()
+    layout, views = monitor._build_dashboard()
+
+    def report(score, services):
+        return {
+            "health_score": score, "timestamp": "now", "recommendations": [],
+            "metrics": {"cpu": {"total_usage": 10}, "memory": {"percent": 20}, "disk": [], "services": services},
+        }
+
+    monitor._render_dashboard(views, report(100, [{"service": "a", "status": "Running", "healthy": True},
+                                                  {"service": "b", "status": "Stopped", "healthy": False}]))
+    monitor._render_dashboard(views, report(50, [{"service": "c", "status": "Running", "healthy": True}]))
+
+    assert views["cpu"].renderable.row_count == 3
+    assert views["services"].renderable.row_count == 1
+    assert list(views["services"].renderable.columns[0].cells) == ["c"]
+    assert "Score: 50/100" in views["header"].renderable
+
+    console = Console(record=True, width=100)
+    console.print(layout)
+    assert "No issues detected." in console.export_text()